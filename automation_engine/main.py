@@ -12,6 +12,7 @@ import sys
 import time
 import signal
 import json
+import logging
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -176,17 +177,14 @@ class AutomationEngineApp:
         try:
             while self.running:
                 try:
-                    # Check for visual navigation requests
-                    visual_request = self.message_broker.receive_visual_navigation_request(timeout=0)
-                    if visual_request:
-                        self.visual_handler.handle_visual_navigation_request(visual_request)
-                        continue
-                    
-                    # Check for visual action commands
-                    action_command = self.message_broker.receive_visual_action_command(timeout=0)
-                    if action_command:
-                        result = self.visual_handler.execute_visual_action(action_command)
-                        self.message_broker.send_visual_action_result(result)
+                    # Check for visual navigation requests and action commands (one scan for both)
+                    visual_message = self.message_broker.receive_visual_engine_message(timeout=0)
+                    if visual_message:
+                        if visual_message.get("type") == "visual_action_command":
+                            result = self.visual_handler.execute_visual_action(visual_message)
+                            self.message_broker.send_visual_action_result(result)
+                        else:
+                            self.visual_handler.handle_visual_navigation_request(visual_message)
                         continue
                     
                     # Poll for incoming protocols
@@ -302,6 +300,9 @@ def main():
     
     args = parser.parse_args()
     
+    # Show the executor's per-action progress on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Create and start the application
     app = AutomationEngineApp(
         config_path=args.config,
@@ -6,6 +6,7 @@ action names to Python functions. It includes parameter validation, type checkin
 and documentation generation capabilities.
 """
 
+import sys
 import time
 import inspect
 import pyperclip
@@ -46,6 +47,10 @@ class ActionHandler:
     returns: Optional[Dict[str, str]] = None
     examples: List[Any] = field(default_factory=list)
     
+    def __post_init__(self):
+        # Accepted parameter names, computed once instead of on every call
+        self._all_params = frozenset(self.required_params) | frozenset(self.optional_params)
+    
     def validate_params(self, params: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """
         Validate parameters for this action.
@@ -62,7 +67,7 @@ class ActionHandler:
                 return False, f"Missing required parameter: {required}"
         
         # Check for unknown parameters
-        all_params = set(self.required_params) | set(self.optional_params.keys())
+        all_params = self._all_params
         for param in params:
             if param not in all_params:
                 return False, f"Unknown parameter: {param}"
@@ -125,6 +130,9 @@ class ActionRegistry:
             returns: Dict describing return values
             examples: List of example parameter values
         """
+        # Intern names so dispatch lookups hit the cached string hash
+        name = sys.intern(name)
+        
         action_handler = ActionHandler(
             name=name,
             category=category,
@@ -155,19 +163,20 @@ class ActionRegistry:
         """
         params = params or {}
         
-        # Check if action exists
-        if action_name not in self._handlers:
+        # Look up the handler (single dict probe)
+        handler = self._handlers.get(action_name)
+        if handler is None:
             raise ValueError(f"Unknown action: {action_name}")
         
-        handler = self._handlers[action_name]
-        
         # Validate parameters
         is_valid, error_msg = handler.validate_params(params)
         if not is_valid:
             raise ValueError(f"Invalid parameters for action '{action_name}': {error_msg}")
         
-        # Merge with defaults
-        final_params = {**handler.optional_params, **params}
+        # Merge with defaults (params are unpacked into a fresh dict for the
+        # call anyway, so handlers without defaults skip the merge)
+        optional_params = handler.optional_params
+        final_params = {**optional_params, **params} if optional_params else params
         
         # Execute handler
         try:
@@ -2,15 +2,153 @@
 File-based communication layer for AI Automation Assistant.
 Provides simple JSON file-based message passing between AI Brain and Automation Engine.
 """
+import asyncio
+import heapq
+import itertools
 import json
+import mmap
 import os
+import re
+import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple, Union
+from dataclasses import fields, is_dataclass
 from datetime import datetime
 
 from shared.data_models import Workflow, WorkflowStep, ExecutionResult
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+# Upper bound on a single wait between directory scans (seconds)
+POLL_INTERVAL = 0.1
+
+# First wait of the polling fallback, which then backs off to POLL_INTERVAL
+MIN_POLL_INTERVAL = 0.001
+
+# Characters not allowed in protocol status filenames
+_SAFE_ID_RE = re.compile(r'[^\w\-_]')
+
+# Source of IDs for protocols sent without one (unique per process)
+_PID = os.getpid()
+_ID_COUNTER = itertools.count()
+
+
+def _reset_process_ids() -> None:
+    """Give a forked child its own pid and counter, so its IDs don't collide."""
+    global _PID, _ID_COUNTER
+    _PID = os.getpid()
+    _ID_COUNTER = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_process_ids)
+
+# Tie-breaker for queue filenames sent within one tick of the monotonic
+# clock (about 15.6 ms on Windows before Python 3.13)
+_SEQ = itertools.count()
+
+# Raw file I/O flags (O_BINARY only exists, and matters, on Windows)
+_O_BINARY = getattr(os, "O_BINARY", 0)
+_FADV_NOREUSE = getattr(os, "POSIX_FADV_NOREUSE", None)
+
+# Message files at least this large (screenshot-bearing visual messages)
+# are memory-mapped and parsed in place instead of copied into bytes
+_MMAP_THRESHOLD = 64 * 1024
+
+
+def _json_default(obj):
+    """Serialize values the stdlib encoder doesn't handle natively."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Set AUTOPILOT_PRETTY_JSON=1 to indent message files while debugging
+_PRETTY_JSON = bool(os.getenv("AUTOPILOT_PRETTY_JSON"))
+
+if orjson is not None:
+    # Non-string keys are stringified, as the stdlib encoder does
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if _PRETTY_JSON else 0)
+    
+    def _dumps(obj) -> bytes:
+        """Serialize a message to UTF-8 JSON bytes."""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    _loads = orjson.loads
+else:
+    # Message files are machine-read, so they are written compact by default
+    _ENCODER = json.JSONEncoder(
+        indent=2 if _PRETTY_JSON else None,
+        separators=(",", ": ") if _PRETTY_JSON else (",", ":"),
+        ensure_ascii=False,
+        check_circular=False,
+        default=_json_default
+    )
+
+    def _dumps(obj) -> bytes:
+        """Serialize a message to UTF-8 JSON bytes."""
+        return _ENCODER.encode(obj).encode("utf-8")
+
+    _loads = json.loads
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    """
+    Write bytes to a file with raw os-level calls.
+    
+    Message files are written once, read once and deleted, so the buffered
+    io wrapper is skipped and the kernel is told not to keep the pages.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if _FADV_NOREUSE is not None:
+            os.posix_fadvise(fd, 0, 0, _FADV_NOREUSE)
+    finally:
+        os.close(fd)
+
+
+def _load_file(path: Path):
+    """
+    Read and parse a message file with raw os-level calls.
+    
+    With orjson available, files of at least _MMAP_THRESHOLD bytes are
+    memory-mapped and parsed straight from the page cache, saving a copy
+    of the whole payload into a bytes object.
+    """
+    fd = os.open(path, os.O_RDONLY | _O_BINARY)
+    try:
+        if _FADV_NOREUSE is not None:
+            os.posix_fadvise(fd, 0, 0, _FADV_NOREUSE)
+        size = os.fstat(fd).st_size
+        
+        if orjson is not None and size >= _MMAP_THRESHOLD:
+            with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                return orjson.loads(view)
+        
+        data = os.read(fd, size)
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return _loads(data)
+    finally:
+        os.close(fd)
+
 
 class CommunicationError(Exception):
     """Raised when communication operations fail."""
@@ -41,6 +179,56 @@ class MessageBroker:
         self.protocol_dir.mkdir(parents=True, exist_ok=True)
         self.status_dir.mkdir(parents=True, exist_ok=True)
         self.visual_nav_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Kernel file notifications (Linux only): one inotify instance per
+        # broker, with one watch per directory mapped back by its descriptor
+        self._inotify = None
+        self._watched_dirs = {}
+        if INotify is not None:
+            self._start_watching()
+    
+    def _start_watching(self) -> None:
+        """
+        Set up the broker's inotify watches, or leave it polling.
+        
+        Inotify instances are a per-user kernel resource (128 by default),
+        so running out of them is not an error: the broker simply falls
+        back to polling the directories.
+        """
+        inotify = None
+        try:
+            inotify = INotify()
+            for directory in (self.workflow_dir, self.protocol_dir,
+                              self.status_dir, self.visual_nav_dir):
+                wd = inotify.add_watch(
+                    str(directory),
+                    inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO
+                )
+                self._watched_dirs[wd] = directory
+        except OSError:
+            if inotify is not None:
+                inotify.close()
+            self._watched_dirs = {}
+            return
+        
+        self._inotify = inotify
+    
+    def close(self) -> None:
+        """Release the broker's inotify descriptor (later waits poll instead)."""
+        inotify = getattr(self, "_inotify", None)
+        if inotify is not None:
+            self._inotify = None
+            self._watched_dirs = {}
+            inotify.close()
+    
+    def __enter__(self) -> "MessageBroker":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def __del__(self):
+        self.close()
     
     def send_workflow(self, workflow: Workflow) -> None:
         """
@@ -55,10 +243,8 @@ class MessageBroker:
         """
         try:
             workflow_data = self._serialize_workflow(workflow)
-            file_path = self.workflow_dir / f"{workflow.id}.json"
-            
-            with open(file_path, 'w') as f:
-                json.dump(workflow_data, f, indent=2)
+            file_path = self.workflow_dir / self._sequenced_name(workflow.id)
+            self._write_message(file_path, workflow_data)
                 
         except Exception as e:
             raise CommunicationError(f"Failed to send workflow: {e}")
@@ -77,38 +263,28 @@ class MessageBroker:
         Raises:
             CommunicationError: If deserialization fails
         """
-        start_time = time.time()
+        workflows = self.receive_workflows(max_batch=1, timeout=timeout)
+        return workflows[0] if workflows else None
+    
+    def receive_workflows(self, max_batch: int = 32, timeout: float = 0) -> List[Workflow]:
+        """
+        Receive up to max_batch queued workflows in send order.
+        Scans the workflow directory once per batch instead of once per workflow.
         
-        while True:
-            try:
-                # Get all workflow files sorted by creation time
-                workflow_files = sorted(
-                    self.workflow_dir.glob("*.json"),
-                    key=lambda p: p.stat().st_ctime
-                )
-                
-                if workflow_files:
-                    file_path = workflow_files[0]
-                    
-                    with open(file_path, 'r') as f:
-                        workflow_data = json.load(f)
-                    
-                    workflow = self._deserialize_workflow(workflow_data)
-                    
-                    # Delete the file after reading
-                    file_path.unlink()
-                    
-                    return workflow
-                
-                # Check timeout
-                if timeout == 0 or (time.time() - start_time) >= timeout:
-                    return None
-                
-                # Wait a bit before checking again
-                time.sleep(0.1)
-                
-            except Exception as e:
-                raise CommunicationError(f"Failed to receive workflow: {e}")
+        Args:
+            max_batch: Maximum number of workflows to return
+            timeout: How long to wait for at least one workflow (0 = no wait)
+            
+        Returns:
+            List of Workflow objects (empty if none arrived in time)
+            
+        Raises:
+            CommunicationError: If deserialization fails
+        """
+        return self._receive_queue(
+            lambda limit: self._oldest_messages(self.workflow_dir, limit),
+            self.workflow_dir, max_batch, timeout, "workflow", self._deserialize_workflow
+        )
     
     def send_status(self, result: ExecutionResult) -> None:
         """
@@ -123,9 +299,7 @@ class MessageBroker:
         try:
             status_data = self._serialize_status(result)
             file_path = self.status_dir / f"{result.workflow_id}_status.json"
-            
-            with open(file_path, 'w') as f:
-                json.dump(status_data, f, indent=2)
+            self._write_message(file_path, status_data)
                 
         except Exception as e:
             raise CommunicationError(f"Failed to send status: {e}")
@@ -144,31 +318,8 @@ class MessageBroker:
         Raises:
             CommunicationError: If deserialization fails
         """
-        start_time = time.time()
         file_path = self.status_dir / f"{workflow_id}_status.json"
-        
-        while True:
-            try:
-                if file_path.exists():
-                    with open(file_path, 'r') as f:
-                        status_data = json.load(f)
-                    
-                    result = self._deserialize_status(status_data)
-                    
-                    # Delete the file after reading
-                    file_path.unlink()
-                    
-                    return result
-                
-                # Check timeout
-                if timeout == 0 or (time.time() - start_time) >= timeout:
-                    return None
-                
-                # Wait a bit before checking again
-                time.sleep(0.1)
-                
-            except Exception as e:
-                raise CommunicationError(f"Failed to receive status: {e}")
+        return self._receive_keyed(file_path, timeout, "status", self._deserialize_status)
     
     def send_protocol(self, protocol: dict) -> None:
         """
@@ -186,14 +337,11 @@ class MessageBroker:
             if 'metadata' not in protocol:
                 protocol['metadata'] = {}
             if 'id' not in protocol['metadata']:
-                import uuid
-                protocol['metadata']['id'] = str(uuid.uuid4())
+                protocol['metadata']['id'] = f"{_PID}-{next(_ID_COUNTER)}"
             
             protocol_id = protocol['metadata']['id']
-            file_path = self.protocol_dir / f"{protocol_id}.json"
-            
-            with open(file_path, 'w') as f:
-                json.dump(protocol, f, indent=2)
+            file_path = self.protocol_dir / self._sequenced_name(protocol_id)
+            self._write_message(file_path, protocol)
                 
         except Exception as e:
             raise CommunicationError(f"Failed to send protocol: {e}")
@@ -212,36 +360,28 @@ class MessageBroker:
         Raises:
             CommunicationError: If deserialization fails
         """
-        start_time = time.time()
+        protocols = self.receive_protocols(max_batch=1, timeout=timeout)
+        return protocols[0] if protocols else None
+    
+    def receive_protocols(self, max_batch: int = 32, timeout: float = 0) -> List[dict]:
+        """
+        Receive up to max_batch queued protocols in send order.
+        Scans the protocol directory once per batch instead of once per protocol.
         
-        while True:
-            try:
-                # Get all protocol files sorted by creation time
-                protocol_files = sorted(
-                    self.protocol_dir.glob("*.json"),
-                    key=lambda p: p.stat().st_ctime
-                )
-                
-                if protocol_files:
-                    file_path = protocol_files[0]
-                    
-                    with open(file_path, 'r') as f:
-                        protocol = json.load(f)
-                    
-                    # Delete the file after reading
-                    file_path.unlink()
-                    
-                    return protocol
-                
-                # Check timeout
-                if timeout == 0 or (time.time() - start_time) >= timeout:
-                    return None
-                
-                # Wait a bit before checking again
-                time.sleep(0.1)
-                
-            except Exception as e:
-                raise CommunicationError(f"Failed to receive protocol: {e}")
+        Args:
+            max_batch: Maximum number of protocols to return
+            timeout: How long to wait for at least one protocol (0 = no wait)
+            
+        Returns:
+            List of protocol dictionaries (empty if none arrived in time)
+            
+        Raises:
+            CommunicationError: If deserialization fails
+        """
+        return self._receive_queue(
+            lambda limit: self._oldest_messages(self.protocol_dir, limit),
+            self.protocol_dir, max_batch, timeout, "protocol"
+        )
     
     def send_protocol_status(self, result) -> None:
         """
@@ -258,17 +398,14 @@ class MessageBroker:
             status_data = {
                 "type": "protocol_status",
                 "protocol_id": result.protocol_id,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(),
                 "payload": result.to_dict()
             }
             
             # Use protocol_id as filename (sanitize it first)
-            import re
-            safe_id = re.sub(r'[^\w\-_]', '_', result.protocol_id)
+            safe_id = _SAFE_ID_RE.sub('_', result.protocol_id)
             file_path = self.status_dir / f"{safe_id}_status.json"
-            
-            with open(file_path, 'w') as f:
-                json.dump(status_data, f, indent=2)
+            self._write_message(file_path, status_data)
                 
         except Exception as e:
             raise CommunicationError(f"Failed to send protocol status: {e}")
@@ -287,35 +424,13 @@ class MessageBroker:
         Raises:
             CommunicationError: If deserialization fails
         """
-        start_time = time.time()
-        
         # Sanitize protocol_id for filename
-        import re
-        safe_id = re.sub(r'[^\w\-_]', '_', protocol_id)
+        safe_id = _SAFE_ID_RE.sub('_', protocol_id)
         file_path = self.status_dir / f"{safe_id}_status.json"
         
-        while True:
-            try:
-                if file_path.exists():
-                    with open(file_path, 'r') as f:
-                        status_data = json.load(f)
-                    
-                    result = status_data.get('payload')
-                    
-                    # Delete the file after reading
-                    file_path.unlink()
-                    
-                    return result
-                
-                # Check timeout
-                if timeout == 0 or (time.time() - start_time) >= timeout:
-                    return None
-                
-                # Wait a bit before checking again
-                time.sleep(0.1)
-                
-            except Exception as e:
-                raise CommunicationError(f"Failed to receive protocol status: {e}")
+        return self._receive_keyed(
+            file_path, timeout, "protocol status", lambda status_data: status_data.get('payload')
+        )
     
     def send_visual_navigation_request(self, request: dict) -> None:
         """
@@ -341,15 +456,13 @@ class MessageBroker:
         try:
             request_data = {
                 "type": "visual_navigation_request",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(),
                 **request
             }
             
             request_id = request.get('request_id', 'unknown')
-            file_path = self.visual_nav_dir / f"request_{request_id}.json"
-            
-            with open(file_path, 'w') as f:
-                json.dump(request_data, f, indent=2)
+            file_path = self.visual_nav_dir / self._sequenced_name(request_id, "request_")
+            self._write_message(file_path, request_data)
                 
         except Exception as e:
             raise CommunicationError(f"Failed to send visual navigation request: {e}")
@@ -367,36 +480,28 @@ class MessageBroker:
         Raises:
             CommunicationError: If deserialization fails
         """
-        start_time = time.time()
+        requests = self.receive_visual_navigation_requests(max_batch=1, timeout=timeout)
+        return requests[0] if requests else None
+    
+    def receive_visual_navigation_requests(self, max_batch: int = 32, timeout: float = 0) -> List[dict]:
+        """
+        Receive up to max_batch queued visual navigation requests, oldest first.
+        Scans the visual navigation directory once per batch instead of once per request.
         
-        while True:
-            try:
-                # Get all request files sorted by creation time
-                request_files = sorted(
-                    self.visual_nav_dir.glob("request_*.json"),
-                    key=lambda p: p.stat().st_ctime
-                )
-                
-                if request_files:
-                    file_path = request_files[0]
-                    
-                    with open(file_path, 'r') as f:
-                        request = json.load(f)
-                    
-                    # Delete the file after reading
-                    file_path.unlink()
-                    
-                    return request
-                
-                # Check timeout
-                if timeout == 0 or (time.time() - start_time) >= timeout:
-                    return None
-                
-                # Wait a bit before checking again
-                time.sleep(0.1)
-                
-            except Exception as e:
-                raise CommunicationError(f"Failed to receive visual navigation request: {e}")
+        Args:
+            max_batch: Maximum number of requests to return
+            timeout: How long to wait for at least one request (0 = no wait)
+            
+        Returns:
+            List of visual navigation request dictionaries (empty if none arrived in time)
+            
+        Raises:
+            CommunicationError: If deserialization fails
+        """
+        return self._receive_queue(
+            lambda limit: self._oldest_by_sequence(self.visual_nav_dir, "request_", limit),
+            self.visual_nav_dir, max_batch, timeout, "visual navigation request"
+        )
     
     def send_visual_navigation_response(self, response: dict) -> None:
         """
@@ -421,15 +526,13 @@ class MessageBroker:
         try:
             response_data = {
                 "type": "visual_navigation_response",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(),
                 **response
             }
             
             request_id = response.get('request_id', 'unknown')
             file_path = self.visual_nav_dir / f"response_{request_id}.json"
-            
-            with open(file_path, 'w') as f:
-                json.dump(response_data, f, indent=2)
+            self._write_message(file_path, response_data)
                 
         except Exception as e:
             raise CommunicationError(f"Failed to send visual navigation response: {e}")
@@ -448,29 +551,8 @@ class MessageBroker:
         Raises:
             CommunicationError: If deserialization fails
         """
-        start_time = time.time()
         file_path = self.visual_nav_dir / f"response_{request_id}.json"
-        
-        while True:
-            try:
-                if file_path.exists():
-                    with open(file_path, 'r') as f:
-                        response = json.load(f)
-                    
-                    # Delete the file after reading
-                    file_path.unlink()
-                    
-                    return response
-                
-                # Check timeout
-                if timeout == 0 or (time.time() - start_time) >= timeout:
-                    return None
-                
-                # Wait a bit before checking again
-                time.sleep(0.1)
-                
-            except Exception as e:
-                raise CommunicationError(f"Failed to receive visual navigation response: {e}")
+        return self._receive_keyed(file_path, timeout, "visual navigation response")
     
     def send_visual_action_command(self, command: dict) -> None:
         """
@@ -496,15 +578,13 @@ class MessageBroker:
         try:
             command_data = {
                 "type": "visual_action_command",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(),
                 **command
             }
             
             request_id = command.get('request_id', 'unknown')
-            file_path = self.visual_nav_dir / f"command_{request_id}.json"
-            
-            with open(file_path, 'w') as f:
-                json.dump(command_data, f, indent=2)
+            file_path = self.visual_nav_dir / self._sequenced_name(request_id, "command_")
+            self._write_message(file_path, command_data)
                 
         except Exception as e:
             raise CommunicationError(f"Failed to send visual action command: {e}")
@@ -522,36 +602,51 @@ class MessageBroker:
         Raises:
             CommunicationError: If deserialization fails
         """
-        start_time = time.time()
+        commands = self.receive_visual_action_commands(max_batch=1, timeout=timeout)
+        return commands[0] if commands else None
+    
+    def receive_visual_action_commands(self, max_batch: int = 32, timeout: float = 0) -> List[dict]:
+        """
+        Receive up to max_batch queued visual action commands, oldest first.
+        Scans the visual navigation directory once per batch instead of once per command.
         
-        while True:
-            try:
-                # Get all command files sorted by creation time
-                command_files = sorted(
-                    self.visual_nav_dir.glob("command_*.json"),
-                    key=lambda p: p.stat().st_ctime
-                )
-                
-                if command_files:
-                    file_path = command_files[0]
-                    
-                    with open(file_path, 'r') as f:
-                        command = json.load(f)
-                    
-                    # Delete the file after reading
-                    file_path.unlink()
-                    
-                    return command
-                
-                # Check timeout
-                if timeout == 0 or (time.time() - start_time) >= timeout:
-                    return None
-                
-                # Wait a bit before checking again
-                time.sleep(0.1)
-                
-            except Exception as e:
-                raise CommunicationError(f"Failed to receive visual action command: {e}")
+        Args:
+            max_batch: Maximum number of commands to return
+            timeout: How long to wait for at least one command (0 = no wait)
+            
+        Returns:
+            List of visual action command dictionaries (empty if none arrived in time)
+            
+        Raises:
+            CommunicationError: If deserialization fails
+        """
+        return self._receive_queue(
+            lambda limit: self._oldest_by_sequence(self.visual_nav_dir, "command_", limit),
+            self.visual_nav_dir, max_batch, timeout, "visual action command"
+        )
+    
+    def receive_visual_engine_message(self, timeout: float = 0) -> Optional[dict]:
+        """
+        Receive the oldest visual navigation request or visual action command.
+        
+        Both channels are served by one directory scan, so a loop that handles
+        either kind polls once instead of once per channel. Dispatch on the
+        message "type" ("visual_navigation_request" or "visual_action_command").
+        
+        Args:
+            timeout: How long to wait for a message (0 = no wait)
+            
+        Returns:
+            Visual navigation request or action command dictionary if found, None otherwise
+            
+        Raises:
+            CommunicationError: If deserialization fails
+        """
+        messages = self._receive_queue(
+            lambda limit: self._oldest_by_sequence(self.visual_nav_dir, ("request_", "command_"), limit),
+            self.visual_nav_dir, 1, timeout, "visual navigation message"
+        )
+        return messages[0] if messages else None
     
     def send_visual_action_result(self, result: dict) -> None:
         """
@@ -577,15 +672,13 @@ class MessageBroker:
         try:
             result_data = {
                 "type": "visual_action_result",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(),
                 **result
             }
             
             request_id = result.get('request_id', 'unknown')
             file_path = self.visual_nav_dir / f"result_{request_id}.json"
-            
-            with open(file_path, 'w') as f:
-                json.dump(result_data, f, indent=2)
+            self._write_message(file_path, result_data)
                 
         except Exception as e:
             raise CommunicationError(f"Failed to send visual action result: {e}")
@@ -604,29 +697,8 @@ class MessageBroker:
         Raises:
             CommunicationError: If deserialization fails
         """
-        start_time = time.time()
         file_path = self.visual_nav_dir / f"result_{request_id}.json"
-        
-        while True:
-            try:
-                if file_path.exists():
-                    with open(file_path, 'r') as f:
-                        result = json.load(f)
-                    
-                    # Delete the file after reading
-                    file_path.unlink()
-                    
-                    return result
-                
-                # Check timeout
-                if timeout == 0 or (time.time() - start_time) >= timeout:
-                    return None
-                
-                # Wait a bit before checking again
-                time.sleep(0.1)
-                
-            except Exception as e:
-                raise CommunicationError(f"Failed to receive visual action result: {e}")
+        return self._receive_keyed(file_path, timeout, "visual action result")
     
     def send_visual_navigation_result(self, result: dict) -> None:
         """
@@ -655,15 +727,13 @@ class MessageBroker:
         try:
             result_data = {
                 "type": "visual_navigation_result",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(),
                 **result
             }
             
             request_id = result.get('request_id', 'unknown')
             file_path = self.visual_nav_dir / f"workflow_result_{request_id}.json"
-            
-            with open(file_path, 'w') as f:
-                json.dump(result_data, f, indent=2)
+            self._write_message(file_path, result_data)
                 
         except Exception as e:
             raise CommunicationError(f"Failed to send visual navigation result: {e}")
@@ -685,46 +755,434 @@ class MessageBroker:
         Raises:
             CommunicationError: If deserialization fails
         """
-        start_time = time.time()
         file_path = self.visual_nav_dir / f"workflow_result_{request_id}.json"
+        return self._receive_keyed(file_path, timeout, "visual navigation result")
+    
+    async def receive_workflow_async(self, timeout: float = 0) -> Optional[Workflow]:
+        """
+        Awaitable version of receive_workflow for asyncio callers.
+        
+        Args:
+            timeout: How long to wait for a workflow (0 = no wait)
+            
+        Returns:
+            Workflow object if found, None otherwise
+        """
+        return await self._receive_async(self.receive_workflow, self.workflow_dir, timeout)
+    
+    async def receive_status_async(self, workflow_id: str, timeout: float = 0) -> Optional[ExecutionResult]:
+        """
+        Awaitable version of receive_status for asyncio callers.
+        
+        Args:
+            workflow_id: ID of the workflow to check status for
+            timeout: How long to wait for status (0 = no wait)
+            
+        Returns:
+            ExecutionResult object if found, None otherwise
+        """
+        return await self._receive_async(self.receive_status, self.status_dir, timeout, workflow_id)
+    
+    async def receive_protocol_async(self, timeout: float = 0) -> Optional[dict]:
+        """
+        Awaitable version of receive_protocol for asyncio callers.
+        
+        Args:
+            timeout: How long to wait for a protocol (0 = no wait)
+            
+        Returns:
+            Protocol dictionary if found, None otherwise
+        """
+        return await self._receive_async(self.receive_protocol, self.protocol_dir, timeout)
+    
+    async def _receive_async(self, receive, directory: Path, timeout: float, *args):
+        """
+        Poll a receive method without blocking the event loop.
+        
+        Args:
+            receive: Non-blocking receive method to call (with timeout=0)
+            directory: Directory the receive method reads from
+            timeout: How long to wait for a message (0 = no wait)
+            *args: Extra positional arguments for the receive method
+            
+        Returns:
+            Received message, or None on timeout
+        """
+        start_time = time.time()
+        
+        while True:
+            message = receive(*args, timeout=0)
+            if message is not None:
+                return message
+            
+            remaining = timeout - (time.time() - start_time)
+            if timeout == 0 or remaining <= 0:
+                return None
+            
+            await self._wait_for_file_async(directory, start_time, timeout)
+    
+    def _receive_queue(self, select, directory: Path, max_batch: int, timeout: float,
+                       label: str, parse=None) -> list:
+        """
+        Receive up to max_batch queued messages, oldest first.
+        
+        Shared loop behind every queue-style receive method: one directory
+        scan per batch, and a wait on the directory between empty scans.
+        
+        Each file is deleted only once its message has parsed. A file that
+        fails after others in the batch parsed is left for the next call.
+        A malformed file that fails first is discarded and its error
+        raised; an I/O error never deletes the file.
+        
+        Args:
+            select: Callable taking a limit and returning the oldest file paths
+            directory: Directory the files are read from
+            max_batch: Maximum number of messages to return
+            timeout: How long to wait for at least one message (0 = no wait)
+            label: Channel name used in error messages
+            parse: Optional callable converting each message dictionary
+            
+        Returns:
+            List of (parsed) messages (empty if none arrived in time)
+            
+        Raises:
+            CommunicationError: If reading or deserialization fails
+        """
+        start_time = time.time()
         
         while True:
             try:
-                if file_path.exists():
-                    with open(file_path, 'r') as f:
-                        result = json.load(f)
-                    
-                    # Delete the file after reading
-                    file_path.unlink()
-                    
-                    return result
+                file_paths = select(max_batch)
+                
+                messages = []
+                for file_path in file_paths:
+                    try:
+                        message = self._take_message(file_path, parse)
+                    except (ValueError, CommunicationError):
+                        # Malformed JSON (JSONDecodeError is a ValueError)
+                        # or a message the parse callable rejected
+                        if messages:
+                            # Hand over what parsed; the bad file is left
+                            # at the head of the queue for the next call
+                            break
+                        self._discard_message(file_path)
+                        raise
+                    except OSError:
+                        # Transient I/O failure: keep the file for a retry
+                        if messages:
+                            break
+                        raise
+                    if message is not None:
+                        messages.append(message)
+                
+                if messages:
+                    return messages
+                if file_paths:
+                    # Taken by another receiver; rescan right away
+                    continue
+                
+                # Check timeout
+                if timeout == 0 or (time.time() - start_time) >= timeout:
+                    return []
+                
+                # Wait for a new file (or the poll interval) before checking again
+                self._wait_for_file(directory, start_time, timeout)
+                
+            except Exception as e:
+                raise CommunicationError(f"Failed to receive {label}: {e}")
+    
+    def _receive_keyed(self, file_path: Path, timeout: float, label: str, parse=None):
+        """
+        Receive the message published under a known filename.
+        
+        Shared loop behind every keyed receive method (status, responses
+        and results looked up by ID).
+        
+        Args:
+            file_path: Path of the expected message file
+            timeout: How long to wait for the message (0 = no wait)
+            label: Channel name used in error messages
+            parse: Optional callable converting the message dictionary
+            
+        Returns:
+            The (parsed) message if found, None otherwise
+            
+        Raises:
+            CommunicationError: If reading or deserialization fails
+        """
+        start_time = time.time()
+        directory = file_path.parent
+        
+        while True:
+            try:
+                message = self._take_message(file_path)
+                if message is not None:
+                    return parse(message) if parse else message
                 
                 # Check timeout
                 if timeout == 0 or (time.time() - start_time) >= timeout:
                     return None
                 
-                # Wait a bit before checking again
-                time.sleep(0.1)
+                # Wait for a new file (or the poll interval) before checking again
+                self._wait_for_file(directory, start_time, timeout)
                 
             except Exception as e:
-                raise CommunicationError(f"Failed to receive visual navigation result: {e}")
+                raise CommunicationError(f"Failed to receive {label}: {e}")
     
-    def clear_messages(self) -> None:
+    @staticmethod
+    def _sequenced_name(message_id: str, prefix: str = "") -> str:
         """
-        Clear all pending messages (workflows, protocols, status, and visual navigation).
-        Useful for cleanup or reset operations.
+        Build a queue filename that sorts in send order.
+        
+        The zero-padded monotonic clock prefix lets receivers find the oldest
+        message by comparing names alone, without a stat() per file. A
+        zero-padded per-process counter follows it, so messages sent within
+        the same clock tick still sort in send order rather than by ID.
+        
+        Args:
+            message_id: Workflow, protocol or request ID
+            prefix: Message kind for directories shared by several kinds
+                (e.g. "request_"); must end with its only underscore
+            
+        Returns:
+            Filename of the form "<prefix><clock>_<counter>_<id>.json"
         """
-        for file_path in self.workflow_dir.glob("*.json"):
-            file_path.unlink()
+        return f"{prefix}{time.monotonic_ns():020d}_{next(_SEQ):012d}_{message_id}.json"
+    
+    @staticmethod
+    def _oldest_messages(directory: Path, limit: int) -> List[Path]:
+        """
+        Find the oldest queued message files in a directory.
         
-        for file_path in self.protocol_dir.glob("*.json"):
-            file_path.unlink()
+        Args:
+            directory: Queue directory to scan
+            limit: Maximum number of files to return
+            
+        Returns:
+            Paths of the lexically smallest *.json files, oldest first
+        """
+        with os.scandir(directory) as entries:
+            names = [entry.name for entry in entries if entry.name.endswith(".json")]
         
-        for file_path in self.status_dir.glob("*.json"):
-            file_path.unlink()
+        return [directory / name for name in heapq.nsmallest(limit, names)]
+    
+    @staticmethod
+    def _oldest_by_sequence(directory: Path, prefix: Union[str, Tuple[str, ...]],
+                            limit: int) -> List[Path]:
+        """
+        Find the oldest message files of a given kind in a shared directory.
         
-        for file_path in self.visual_nav_dir.glob("*.json"):
+        Names are compared on the sequence after the kind prefix, so several
+        kinds can be merged in send order without a stat() per file.
+        
+        Args:
+            directory: Directory to scan
+            prefix: Filename prefix of the message kind (e.g. "request_"),
+                or a tuple of prefixes to scan several kinds at once
+            limit: Maximum number of files to return
+            
+        Returns:
+            Paths of the oldest matching *.json files, oldest first
+        """
+        with os.scandir(directory) as entries:
+            names = [
+                entry.name for entry in entries
+                if entry.name.startswith(prefix) and entry.name.endswith(".json")
+            ]
+        
+        oldest = heapq.nsmallest(limit, names, key=lambda name: name.partition("_")[2])
+        return [directory / name for name in oldest]
+    
+    @staticmethod
+    def _write_message(file_path: Path, message: dict) -> None:
+        """
+        Serialize a message and publish it atomically.
+        
+        The bytes are written to a temporary sibling and then renamed into
+        place, so receivers never see a partially written *.json file. The
+        temporary name is unique per process and thread, so two senders of
+        the same keyed message never write into each other's file.
+        
+        Args:
+            file_path: Final path of the message file
+            message: Message to serialize
+        """
+        tmp_path = file_path.with_name(
+            f"{file_path.name}.{_PID}.{threading.get_ident()}.tmp"
+        )
+        _write_file(tmp_path, _dumps(message))
+        os.replace(tmp_path, file_path)
+    
+    def _take_message(self, file_path: Path, parse=None) -> Optional[dict]:
+        """
+        Read, parse and delete a message file in one pass.
+        
+        Opening the file directly (instead of checking exists() first) saves
+        a filesystem round trip on every poll of a keyed channel.
+        
+        Args:
+            file_path: Path of the expected message file
+            parse: Optional callable converting the message dictionary; the
+                file is only deleted once it succeeds
+            
+        Returns:
+            Parsed message, or None if the file does not exist yet
+        """
+        try:
+            message = _load_file(file_path)
+        except FileNotFoundError:
+            return None
+        
+        if parse is not None:
+            message = parse(message)
+        
+        # Delete the file after reading
+        file_path.unlink()
+        
+        return message
+    
+    @staticmethod
+    def _discard_message(file_path: Path) -> None:
+        """Delete a message file that could not be read or parsed."""
+        try:
             file_path.unlink()
+        except FileNotFoundError:
+            # Already removed by another receiver
+            pass
+    
+    @staticmethod
+    def _wait_bounds(start_time: float, timeout: float) -> Tuple[float, float]:
+        """
+        Compute how long a receiver may wait before its next scan.
+        
+        Args:
+            start_time: time.time() at which the caller started waiting
+            timeout: Caller's total timeout in seconds
+            
+        Returns:
+            Tuple of (wait, backoff): the longest allowed wait for a
+            notification, and the polling-fallback sleep, both in seconds
+        """
+        elapsed = time.time() - start_time
+        wait = min(max(timeout - elapsed, 0), POLL_INTERVAL)
+        return wait, min(wait, max(elapsed, MIN_POLL_INTERVAL))
+    
+    def _wait_for_file(self, directory: Path, start_time: float, timeout: float) -> None:
+        """
+        Block until a file is written into a directory or the wait expires.
+        
+        Uses inotify when available so the caller wakes as soon as a message
+        lands. Otherwise it falls back to polling with exponential backoff:
+        each sleep lasts as long as the caller has already waited, starting
+        at MIN_POLL_INTERVAL, so quick replies are picked up within a few
+        milliseconds while idle receivers settle at one scan per
+        POLL_INTERVAL. A single wait never exceeds POLL_INTERVAL, so
+        receivers sharing a directory still rescan on time if another
+        receiver consumed the notification.
+        
+        Args:
+            directory: Directory being polled
+            start_time: time.time() at which the caller started waiting
+            timeout: Caller's total timeout in seconds
+        """
+        wait, backoff = self._wait_bounds(start_time, timeout)
+        inotify = self._inotify
+        
+        if inotify is None:
+            time.sleep(backoff)
+            return
+        
+        # Events for the broker's other directories don't end the wait
+        deadline = time.monotonic() + wait
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._has_event_for(
+                    directory, inotify.read(timeout=int(remaining * 1000))):
+                return
+    
+    async def _wait_for_file_async(self, directory: Path, start_time: float, timeout: float) -> None:
+        """
+        Awaitable counterpart of _wait_for_file.
+        
+        Registers the broker's inotify descriptor with the running event
+        loop, so the coroutine resumes as soon as a message lands in the
+        directory. Without inotify it sleeps on the loop with the same
+        backoff instead.
+        
+        Args:
+            directory: Directory being polled
+            start_time: time.time() at which the caller started waiting
+            timeout: Caller's total timeout in seconds
+        """
+        wait, backoff = self._wait_bounds(start_time, timeout)
+        inotify = self._inotify
+        
+        if inotify is None:
+            await asyncio.sleep(backoff)
+            return
+        
+        loop = asyncio.get_running_loop()
+        fd = inotify.fileno()
+        deadline = time.monotonic() + wait
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            
+            ready = loop.create_future()
+            
+            def on_readable(ready=ready):
+                if not ready.done():
+                    ready.set_result(None)
+            
+            loop.add_reader(fd, on_readable)
+            try:
+                await asyncio.wait_for(ready, remaining)
+            except asyncio.TimeoutError:
+                return
+            finally:
+                loop.remove_reader(fd)
+            
+            # Drain the queued events so the next wait blocks again
+            if self._has_event_for(directory, inotify.read(timeout=0)):
+                return
+    
+    def _has_event_for(self, directory: Path, events) -> bool:
+        """
+        Check whether inotify events include one for a directory.
+        
+        An empty event list (read timed out) also counts, so the caller
+        rescans instead of waiting again.
+        
+        Args:
+            directory: Directory the caller is waiting on
+            events: Events returned by INotify.read()
+            
+        Returns:
+            True if the caller should stop waiting and rescan
+        """
+        if not events:
+            return True
+        watched_dirs = self._watched_dirs
+        return any(watched_dirs.get(event.wd) == directory for event in events)
+    
+    def clear_messages(self) -> None:
+        """
+        Clear all pending messages (workflows, protocols, status, and visual navigation).
+        Useful for cleanup or reset operations.
+        """
+        # The directories themselves are kept so inotify watches stay valid.
+        # Temporary files left behind by a sender that died mid-write go too.
+        for directory in (self.workflow_dir, self.protocol_dir, self.status_dir, self.visual_nav_dir):
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith((".json", ".tmp")):
+                        try:
+                            os.unlink(entry.path)
+                        except FileNotFoundError:
+                            # Consumed by a receiver mid-scan
+                            pass
     
     def _serialize_workflow(self, workflow: Workflow) -> dict:
         """
@@ -739,20 +1197,12 @@ class MessageBroker:
         return {
             "type": "workflow",
             "id": workflow.id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "payload": {
-                "steps": [
-                    {
-                        "type": step.type,
-                        "coordinates": step.coordinates,
-                        "data": step.data,
-                        "delay_ms": step.delay_ms,
-                        "validation": step.validation
-                    }
-                    for step in workflow.steps
-                ],
+                # WorkflowStep dataclasses are encoded field-by-field by _dumps
+                "steps": workflow.steps,
                 "metadata": workflow.metadata,
-                "created_at": workflow.created_at.isoformat()
+                "created_at": workflow.created_at
             }
         }
     
@@ -775,7 +1225,7 @@ class MessageBroker:
             steps = [
                 WorkflowStep(
                     type=step["type"],
-                    coordinates=tuple(step["coordinates"]) if step["coordinates"] else None,
+                    coordinates=(coords[0], coords[1]) if (coords := step["coordinates"]) else None,
                     data=step["data"],
                     delay_ms=step["delay_ms"],
                     validation=step["validation"]
@@ -805,7 +1255,7 @@ class MessageBroker:
         return {
             "type": "status",
             "workflow_id": result.workflow_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "payload": {
                 "status": result.status,
                 "steps_completed": result.steps_completed,
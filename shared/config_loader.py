@@ -6,18 +6,27 @@ Provides easy access to protocol system configuration settings from config.json.
 
 import json
 import os
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+import threading
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, Optional
+from dataclasses import dataclass, fields
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+@dataclass(frozen=True, slots=True)
 class ValidationConfig:
     """Protocol validation configuration."""
     strict_mode: bool = False
     warning_level: str = "all"  # 'none', 'errors_only', 'all'
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class VisualVerificationConfig:
     """Visual verification configuration."""
     enabled: bool = True
@@ -27,7 +36,7 @@ class VisualVerificationConfig:
     fallback_model: str = "gemini-2.5-flash"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MouseMovementConfig:
     """Mouse movement configuration."""
     smooth: bool = True
@@ -42,20 +51,30 @@ class MouseMovementConfig:
     max_duration: float = 1.5
 
 
-@dataclass
+_DEFAULT_CATEGORIES = frozenset({
+    "keyboard", "mouse", "window", "browser", "clipboard",
+    "file", "screen", "timing", "vision", "system", "edit", "macro"
+})
+
+
+@dataclass(frozen=True, slots=True)
 class ActionLibraryConfig:
     """Action library configuration."""
-    enabled_categories: List[str] = None
-    disabled_actions: List[str] = None
+    enabled_categories: FrozenSet[str] = None
+    disabled_actions: FrozenSet[str] = None
     
     def __post_init__(self):
-        if self.enabled_categories is None:
-            self.enabled_categories = [
-                "keyboard", "mouse", "window", "browser", "clipboard",
-                "file", "screen", "timing", "vision", "system", "edit", "macro"
-            ]
-        if self.disabled_actions is None:
-            self.disabled_actions = []
+        enabled_categories = self.enabled_categories
+        if enabled_categories is None:
+            enabled_categories = _DEFAULT_CATEGORIES
+        disabled_actions = self.disabled_actions
+        if disabled_actions is None:
+            disabled_actions = ()
+        
+        # Sets, so is_action_enabled is a hash lookup (lists from config.json are converted).
+        # The dataclass is frozen, so the normalized values are set through object.__setattr__.
+        object.__setattr__(self, 'enabled_categories', frozenset(enabled_categories))
+        object.__setattr__(self, 'disabled_actions', frozenset(disabled_actions))
     
     def is_action_enabled(self, action_name: str, category: str) -> bool:
         """Check if an action is enabled."""
@@ -66,7 +85,7 @@ class ActionLibraryConfig:
         return True
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProtocolConfig:
     """Complete protocol system configuration."""
     validation: ValidationConfig
@@ -75,6 +94,24 @@ class ProtocolConfig:
     action_library: ActionLibraryConfig
 
 
+def _build_section(config_class, section_data: Dict[str, Any]):
+    """
+    Build a config dataclass from its section of config.json.
+    
+    Keys missing from the file keep the dataclass defaults; keys the
+    dataclass doesn't define (such as "note") are ignored.
+    
+    Args:
+        config_class: Config dataclass to instantiate
+        section_data: Section dictionary from config.json
+        
+    Returns:
+        Instance of config_class
+    """
+    names = {f.name for f in fields(config_class)}
+    return config_class(**{key: value for key, value in section_data.items() if key in names})
+
+
 class ConfigLoader:
     """
     Load and provide access to protocol system configuration.
@@ -87,6 +124,7 @@ class ConfigLoader:
     
     _instance: Optional['ConfigLoader'] = None
     _config: Optional[ProtocolConfig] = None
+    _lock = threading.Lock()
     
     def __init__(self, config_path: str = "config.json"):
         """
@@ -99,53 +137,48 @@ class ConfigLoader:
         self._load_config()
     
     def _load_config(self) -> None:
-        """Load configuration from config.json."""
+        """
+        Load configuration from config.json.
+        
+        The parsed result is cached per path and modification time, so
+        reloading an unchanged file skips the parse while edits are still
+        picked up.
+        """
+        config_path = os.path.abspath(self.config_path)
         try:
-            with open(self.config_path, 'r') as f:
-                data = json.load(f)
-            
-            protocol_data = data.get('protocol', {})
-            
-            # Load validation config
-            validation_data = protocol_data.get('validation', {})
-            validation = ValidationConfig(
-                strict_mode=validation_data.get('strict_mode', False),
-                warning_level=validation_data.get('warning_level', 'all')
-            )
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        self._config = self._parse_config(config_path, mtime_ns)
+    
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _parse_config(config_path: str, mtime_ns: Optional[int]) -> ProtocolConfig:
+        """
+        Parse config.json into a ProtocolConfig.
+        
+        Args:
+            config_path: Path to config.json file
+            mtime_ns: Modification time of the file (cache key only)
             
-            # Load visual verification config
-            vision_data = protocol_data.get('visual_verification', {})
-            visual_verification = VisualVerificationConfig(
-                enabled=vision_data.get('enabled', True),
-                timeout_seconds=vision_data.get('timeout_seconds', 10),
-                confidence_threshold=vision_data.get('confidence_threshold', 0.7),
-                primary_model=vision_data.get('primary_model', 'gemini-flash-lite-latest'),
-                fallback_model=vision_data.get('fallback_model', 'gemini-2.5-flash')
-            )
+        Returns:
+            ProtocolConfig instance (defaults if the file is missing or invalid)
+        """
+        try:
+            with open(config_path, 'rb') as f:
+                data = _loads(f.read())
             
-            # Load mouse movement config
-            mouse_data = protocol_data.get('mouse_movement', {})
-            mouse_movement = MouseMovementConfig(
-                smooth=mouse_data.get('smooth', True),
-                curve_type=mouse_data.get('curve_type', 'bezier'),
-                curve_intensity=mouse_data.get('curve_intensity', 0.3),
-                speed=mouse_data.get('speed', 1.0),
-                overshoot=mouse_data.get('overshoot', True),
-                overshoot_amount=mouse_data.get('overshoot_amount', 0.05),
-                add_noise=mouse_data.get('add_noise', True),
-                noise_amount=mouse_data.get('noise_amount', 2.0),
-                min_duration=mouse_data.get('min_duration', 0.3),
-                max_duration=mouse_data.get('max_duration', 1.5)
-            )
+            protocol_data = data.get('protocol', {})
             
-            # Load action library config
-            action_data = protocol_data.get('action_library', {})
-            action_library = ActionLibraryConfig(
-                enabled_categories=action_data.get('enabled_categories'),
-                disabled_actions=action_data.get('disabled_actions', [])
+            # Each section overrides its dataclass defaults
+            validation = _build_section(ValidationConfig, protocol_data.get('validation', {}))
+            visual_verification = _build_section(
+                VisualVerificationConfig, protocol_data.get('visual_verification', {})
             )
+            mouse_movement = _build_section(MouseMovementConfig, protocol_data.get('mouse_movement', {}))
+            action_library = _build_section(ActionLibraryConfig, protocol_data.get('action_library', {}))
             
-            self._config = ProtocolConfig(
+            return ProtocolConfig(
                 validation=validation,
                 visual_verification=visual_verification,
                 mouse_movement=mouse_movement,
@@ -153,13 +186,14 @@ class ConfigLoader:
             )
             
         except FileNotFoundError:
-            print(f"Warning: Config file not found at {self.config_path}, using defaults")
-            self._config = self._get_default_config()
+            print(f"Warning: Config file not found at {config_path}, using defaults")
+            return ConfigLoader._get_default_config()
         except Exception as e:
             print(f"Warning: Error loading config: {e}, using defaults")
-            self._config = self._get_default_config()
+            return ConfigLoader._get_default_config()
     
-    def _get_default_config(self) -> ProtocolConfig:
+    @staticmethod
+    def _get_default_config() -> ProtocolConfig:
         """Get default configuration."""
         return ProtocolConfig(
             validation=ValidationConfig(),
@@ -185,7 +219,10 @@ class ConfigLoader:
             ProtocolConfig instance
         """
         if cls._instance is None:
-            cls._instance = cls(config_path)
+            # Only the first load takes the lock; later calls are a plain read
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls(config_path)
         return cls._instance.config
     
     @classmethod
@@ -199,7 +236,8 @@ class ConfigLoader:
         Returns:
             ProtocolConfig instance
         """
-        cls._instance = cls(config_path)
+        with cls._lock:
+            cls._instance = cls(config_path)
         return cls._instance.config
 
 
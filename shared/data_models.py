@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowStep:
     """Represents a single step in an automation workflow."""
     type: str  # "mouse_move", "click", "type", "wait", "capture"
@@ -17,7 +17,7 @@ class WorkflowStep:
     validation: Optional[dict] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Workflow:
     """Represents a complete automation workflow."""
     id: str
@@ -26,7 +26,7 @@ class Workflow:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Represents the result of workflow execution."""
     workflow_id: str
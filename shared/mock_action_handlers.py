@@ -8,19 +8,41 @@ These handlers simulate the behavior of real actions but don't:
 - Capture screenshots
 
 Perfect for testing protocol generation and execution flow.
+Each simulated action is traced at DEBUG level on this module's logger.
 """
+import logging
 import time
 import random
+from collections import Counter, deque
 from typing import Dict, Any
 
+logger = logging.getLogger(__name__)
+
+# Oldest execution log entries are dropped beyond this many
+MAX_LOG_ENTRIES = 100_000
+
+
+def _no_sleep(seconds: float) -> None:
+    """Stand-in for time.sleep when simulated durations are skipped."""
+
 
 class MockActionHandlers:
     """Mock implementations of action handlers for testing."""
     
-    def __init__(self, action_registry):
-        """Initialize mock handlers with action registry."""
+    def __init__(self, action_registry, fast_mode: bool = False):
+        """
+        Initialize mock handlers with action registry.
+        
+        Args:
+            action_registry: ActionRegistry to register the mock actions with
+            fast_mode: Skip the simulated action durations (no real sleeping)
+        """
         self.action_registry = action_registry
-        self.execution_log = []
+        self._sleep = _no_sleep if fast_mode else time.sleep
+        # Entries are (action, params, result, timestamp_ns) tuples; bounded so
+        # long mock sessions don't grow without limit
+        self.execution_log = deque(maxlen=MAX_LOG_ENTRIES)
+        self._log_append = self.execution_log.append
     
     def register_all_mock_actions(self):
         """Register all mock actions with the action registry."""
@@ -126,26 +148,21 @@ class MockActionHandlers:
     
     def _log_action(self, action_name: str, params: Dict[str, Any], result: Any = None):
         """Log action execution for debugging."""
-        self.execution_log.append({
-            'action': action_name,
-            'params': params,
-            'result': result,
-            'timestamp': time.time()
-        })
+        self._log_append((action_name, params, result, time.perf_counter_ns()))
     
     # Mouse action mocks
     def _mock_mouse_move(self, x: int, y: int, smooth: bool = True, duration_ms: int = 200, **kwargs) -> Dict[str, Any]:
         """Mock mouse movement."""
-        print(f"  [MOCK] Moving mouse to ({x}, {y})")
-        time.sleep(duration_ms / 1000.0)
+        logger.debug("[MOCK] Moving mouse to (%s, %s)", x, y)
+        self._sleep(duration_ms / 1000.0)
         result = {'x': x, 'y': y, 'success': True}
         self._log_action('mouse_move', {'x': x, 'y': y}, result)
         return result
     
     def _mock_mouse_click(self, button: str = 'left', clicks: int = 1, **kwargs) -> Dict[str, Any]:
         """Mock mouse click."""
-        print(f"  [MOCK] Clicking {button} button ({clicks}x)")
-        time.sleep(0.1)
+        logger.debug("[MOCK] Clicking %s button (%sx)", button, clicks)
+        self._sleep(0.1)
         result = {'button': button, 'clicks': clicks, 'success': True}
         self._log_action('mouse_click', {'button': button, 'clicks': clicks}, result)
         return result
@@ -153,25 +170,26 @@ class MockActionHandlers:
     # Keyboard action mocks
     def _mock_type(self, text: str, interval: float = 0.05, **kwargs) -> Dict[str, Any]:
         """Mock typing text."""
-        print(f"  [MOCK] Typing: '{text[:50]}{'...' if len(text) > 50 else ''}'")
-        time.sleep(len(text) * interval)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[MOCK] Typing: '%s%s'", text[:50], '...' if len(text) > 50 else '')
+        self._sleep(len(text) * interval)
         result = {'text': text, 'length': len(text), 'success': True}
         self._log_action('type', {'text': text}, result)
         return result
     
     def _mock_press_key(self, key: str, **kwargs) -> Dict[str, Any]:
         """Mock key press."""
-        print(f"  [MOCK] Pressing key: {key}")
-        time.sleep(0.05)
+        logger.debug("[MOCK] Pressing key: %s", key)
+        self._sleep(0.05)
         result = {'key': key, 'success': True}
         self._log_action('press_key', {'key': key}, result)
         return result
     
     def _mock_shortcut(self, keys: list, **kwargs) -> Dict[str, Any]:
         """Mock keyboard shortcut."""
-        shortcut_str = '+'.join(keys)
-        print(f"  [MOCK] Pressing shortcut: {shortcut_str}")
-        time.sleep(0.1)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[MOCK] Pressing shortcut: %s", '+'.join(keys))
+        self._sleep(0.1)
         result = {'keys': keys, 'success': True}
         self._log_action('shortcut', {'keys': keys}, result)
         return result
@@ -179,16 +197,16 @@ class MockActionHandlers:
     # Application action mocks
     def _mock_open_app(self, app_name: str, **kwargs) -> Dict[str, Any]:
         """Mock opening application."""
-        print(f"  [MOCK] Opening application: {app_name}")
-        time.sleep(1.0)  # Simulate app launch time
+        logger.debug("[MOCK] Opening application: %s", app_name)
+        self._sleep(1.0)  # Simulate app launch time
         result = {'app_name': app_name, 'success': True}
         self._log_action('open_app', {'app_name': app_name}, result)
         return result
     
     def _mock_open_url(self, url: str, **kwargs) -> Dict[str, Any]:
         """Mock opening URL."""
-        print(f"  [MOCK] Opening URL: {url}")
-        time.sleep(0.5)
+        logger.debug("[MOCK] Opening URL: %s", url)
+        self._sleep(0.5)
         result = {'url': url, 'success': True}
         self._log_action('open_url', {'url': url}, result)
         return result
@@ -196,19 +214,17 @@ class MockActionHandlers:
     # Visual action mocks
     def _mock_visual_navigate(self, task: str, goal: str = None, max_iterations: int = 10, **kwargs) -> Dict[str, Any]:
         """Mock visual navigation."""
-        print(f"  [MOCK] Visual navigate: {task}")
-        print(f"    Goal: {goal or task}")
+        logger.debug("[MOCK] Visual navigate: %s (goal: %s)", task, goal or task)
         
         # Simulate some iterations
         iterations = random.randint(1, 3)
         for i in range(iterations):
-            print(f"    Iteration {i+1}/{iterations}: Analyzing screen...")
-            time.sleep(0.3)
+            logger.debug("[MOCK] Iteration %d/%d: Analyzing screen...", i + 1, iterations)
+            self._sleep(0.3)
         
         # Simulate success
         mock_coords = {'x': random.randint(100, 1800), 'y': random.randint(100, 1000)}
-        print(f"    ✓ Found target at ({mock_coords['x']}, {mock_coords['y']})")
-        print(f"    ✓ Clicked successfully")
+        logger.debug("[MOCK] Found target at (%d, %d) and clicked", mock_coords['x'], mock_coords['y'])
         
         result = {
             'task': task,
@@ -221,18 +237,16 @@ class MockActionHandlers:
     
     def _mock_verify_screen(self, context: str, expected: str, confidence_threshold: float = 0.7, **kwargs) -> Dict[str, Any]:
         """Mock screen verification."""
-        print(f"  [MOCK] Verifying screen")
-        print(f"    Context: {context}")
-        print(f"    Expected: {expected}")
+        logger.debug("[MOCK] Verifying screen (context: %s, expected: %s)", context, expected)
         
-        time.sleep(0.5)  # Simulate analysis time
+        self._sleep(0.5)  # Simulate analysis time
         
         # Randomly succeed or fail (80% success rate)
         safe = random.random() > 0.2
         confidence = random.uniform(0.7, 0.95) if safe else random.uniform(0.3, 0.6)
         
         if safe:
-            print(f"    ✓ SAFE (confidence: {confidence:.2f})")
+            logger.debug("[MOCK] SAFE (confidence: %.2f)", confidence)
             mock_coords = {'x': random.randint(100, 1800), 'y': random.randint(100, 1000)}
             result = {
                 'safe_to_proceed': True,
@@ -242,7 +256,7 @@ class MockActionHandlers:
                 'verified_y': mock_coords['y']
             }
         else:
-            print(f"    ✗ NOT SAFE (confidence: {confidence:.2f})")
+            logger.debug("[MOCK] NOT SAFE (confidence: %.2f)", confidence)
             result = {
                 'safe_to_proceed': False,
                 'confidence': confidence,
@@ -256,20 +270,31 @@ class MockActionHandlers:
     # Utility action mocks
     def _mock_wait(self, duration_ms: int, **kwargs) -> Dict[str, Any]:
         """Mock wait/delay."""
-        print(f"  [MOCK] Waiting {duration_ms}ms")
-        time.sleep(duration_ms / 1000.0)
+        logger.debug("[MOCK] Waiting %sms", duration_ms)
+        self._sleep(duration_ms / 1000.0)
         result = {'duration_ms': duration_ms, 'success': True}
         self._log_action('wait', {'duration_ms': duration_ms}, result)
         return result
     
     def get_execution_log(self) -> list:
-        """Get the execution log."""
-        return self.execution_log
+        """
+        Get the execution log.
+        
+        Returns:
+            List of dicts with 'action', 'params', 'result' and 'timestamp_ns'
+            (time.perf_counter_ns() at the time the action finished), covering
+            at most the last MAX_LOG_ENTRIES actions
+        """
+        return [
+            {'action': action, 'params': params, 'result': result, 'timestamp_ns': timestamp_ns}
+            for action, params, result, timestamp_ns in self.execution_log
+        ]
     
     def clear_log(self):
         """Clear the execution log."""
-        self.execution_log = []
-        print("  Execution log cleared")
+        # Cleared in place so the pre-bound append stays valid
+        self.execution_log.clear()
+        logger.debug("[MOCK] Execution log cleared")
     
     def print_summary(self):
         """Print execution summary."""
@@ -279,10 +304,7 @@ class MockActionHandlers:
         print(f"Total actions executed: {len(self.execution_log)}")
         
         # Count by action type
-        action_counts = {}
-        for entry in self.execution_log:
-            action = entry['action']
-            action_counts[action] = action_counts.get(action, 0) + 1
+        action_counts = Counter(entry[0] for entry in self.execution_log)
         
         print(f"\nActions by type:")
         for action, count in sorted(action_counts.items()):
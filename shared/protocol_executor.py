@@ -3,19 +3,86 @@ Protocol Executor for JSON Instruction Protocol
 
 This module provides the execution engine for the JSON Instruction Protocol,
 handling sequential action execution, timing, context management, and control flow.
+Per-action progress is logged at INFO level and per-action details
+(parameters, dry-run output) at DEBUG level on this module's logger.
 """
 
+import logging
+import re
 import time
 import threading
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from shared.protocol_models import ProtocolSchema, ActionStep
 from shared.action_registry import ActionRegistry
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Variable reference in a parameter string: {{variable_name}}
+_VAR_PATTERN = re.compile(r'\{\{(\w+)\}\}')
+
+
+@lru_cache(maxsize=1024)
+def _parse_template(value: str) -> Tuple[Tuple[str, ...], Optional[str], Optional[str]]:
+    """
+    Parse the {{variable}} references in a template string.
+    
+    Parsed once per distinct string, so macros that run repeatedly don't
+    rescan the same parameter templates on every invocation.
+    
+    Args:
+        value: String that may contain variable references
+        
+    Returns:
+        Tuple of (referenced variable names in order, variable name if the
+        whole string is a single reference else None, str.format_map
+        template or None if a name can't be used as a format field)
+    """
+    names = []
+    parts = []
+    position = 0
+    for match in _VAR_PATTERN.finditer(value):
+        names.append(match.group(1))
+        # Literal braces are doubled so format_map leaves them as-is
+        parts.append(value[position:match.start()].replace('{', '{{').replace('}', '}}'))
+        parts.append('{' + match.group(1) + '}')
+        position = match.end()
+    parts.append(value[position:].replace('{', '{{').replace('}', '}}'))
+    
+    whole = _VAR_PATTERN.fullmatch(value)
+    # Fields starting with a digit would be read as positional indexes
+    template = None if any(name[0].isdigit() for name in names) else ''.join(parts)
+    return tuple(names), whole.group(1) if whole else None, template
+
+
+@dataclass(slots=True)
+class ActionResult:
+    """Outcome of a single executed action, recorded in the execution context."""
+    index: int
+    action: str
+    result: Any
+    error: Optional[str]
+    timestamp: float  # Epoch seconds; formatted as ISO 8601 only in to_dict()
+    
+    def __getitem__(self, key: str) -> Any:
+        """Read a field by name, as with the dict entries results used to be."""
+        return getattr(self, key)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            'index': self.index,
+            'action': self.action,
+            'result': self.result,
+            'error': self.error,
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+
+@dataclass(slots=True)
 class ExecutionContext:
     """
     Maintains state and context during protocol execution.
@@ -24,23 +91,19 @@ class ExecutionContext:
     protocol_id: str
     start_time: datetime = field(default_factory=datetime.now)
     variables: Dict[str, Any] = field(default_factory=dict)
-    action_results: List[Dict[str, Any]] = field(default_factory=list)
+    action_results: List[ActionResult] = field(default_factory=list)
     current_action_index: int = 0
     
     def add_result(self, action_name: str, result: Any, error: Optional[str] = None) -> None:
         """Add an action result to the context."""
-        self.action_results.append({
-            'index': self.current_action_index,
-            'action': action_name,
-            'result': result,
-            'error': error,
-            'timestamp': datetime.now().isoformat()
-        })
+        self.action_results.append(
+            ActionResult(self.current_action_index, action_name, result, error, time.time())
+        )
     
     def get_last_result(self) -> Optional[Any]:
         """Get the result from the last executed action."""
         if self.action_results:
-            return self.action_results[-1].get('result')
+            return self.action_results[-1].result
         return None
     
     def set_variable(self, name: str, value: Any) -> None:
@@ -57,12 +120,12 @@ class ExecutionContext:
             'protocol_id': self.protocol_id,
             'start_time': self.start_time.isoformat(),
             'variables': self.variables,
-            'action_results': self.action_results,
+            'action_results': [entry.to_dict() for entry in self.action_results],
             'current_action_index': self.current_action_index
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionError:
     """Structured error information for protocol execution."""
     action_index: int
@@ -86,7 +149,7 @@ class ExecutionError:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of protocol execution."""
     protocol_id: str
@@ -154,6 +217,14 @@ class ProtocolExecutor:
         self._current_context: Optional[ExecutionContext] = None
         self._current_error: Optional[ExecutionError] = None
         
+        # Time slept past the last requested wait, taken off the next one so
+        # scheduler jitter doesn't accumulate over long protocols
+        self._oversleep = 0.0
+        
+        # Set while not paused; the execution loop blocks on it to wait out a pause
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        
         # Thread lock for state management
         self._lock = threading.Lock()
     
@@ -187,42 +258,41 @@ class ProtocolExecutor:
             self._is_running = True
             self._should_stop = False
             self._is_paused = False
+            self._resume_event.set()
             self._current_protocol = protocol
             self._current_context = ExecutionContext(
                 protocol_id=protocol.metadata.description
             )
             self._current_error = None
+            self._oversleep = 0.0
         
-        start_time = time.time()
+        start_time = time.monotonic()
+        total_actions = len(protocol.actions)
         actions_completed = 0
         error_message = None
+        prefix = '[DRY RUN] ' if self.dry_run else ''
         
         try:
-            print(f"{'[DRY RUN] ' if self.dry_run else ''}Starting protocol: {protocol.metadata.description}")
-            print(f"Total actions: {len(protocol.actions)}")
+            print(f"{prefix}Starting protocol: {protocol.metadata.description}")
+            print(f"Total actions: {total_actions}")
             print(f"Complexity: {protocol.metadata.complexity}")
             
             # Execute each action sequentially
             for i, action in enumerate(protocol.actions):
                 self._current_context.current_action_index = i
                 
-                # Check for stop signal
-                if self._should_stop:
-                    error_message = 'Execution stopped by user'
-                    break
-                
-                # Handle pause
-                while self._is_paused and not self._should_stop:
-                    time.sleep(0.1)
+                # Handle pause (resume and stop both set the event, so one
+                # stop check after it covers both cases)
+                self._resume_event.wait()
                 
                 if self._should_stop:
                     error_message = 'Execution stopped by user'
                     break
                 
                 # Execute the action
-                print(f"{'[DRY RUN] ' if self.dry_run else ''}[{i + 1}/{len(protocol.actions)}] Executing: {action.action}")
+                logger.info("%s[%d/%d] Executing: %s", prefix, i + 1, total_actions, action.action)
                 if action.description:
-                    print(f"  Description: {action.description}")
+                    logger.debug("  Description: %s", action.description)
                 
                 try:
                     result = self._execute_action(action)
@@ -231,11 +301,10 @@ class ProtocolExecutor:
                     
                     # Apply wait_after_ms timing
                     if action.wait_after_ms > 0:
-                        wait_seconds = action.wait_after_ms / 1000.0
                         if self.dry_run:
-                            print(f"  [DRY RUN] Would wait {action.wait_after_ms}ms")
+                            logger.debug("  [DRY RUN] Would wait %sms", action.wait_after_ms)
                         else:
-                            time.sleep(wait_seconds)
+                            self._wait(action.wait_after_ms / 1000.0)
                     
                 except Exception as action_error:
                     # Create structured error information
@@ -259,9 +328,9 @@ class ProtocolExecutor:
             # Determine final status
             if error_message:
                 status = 'stopped' if 'stopped' in error_message else 'failed'
-            elif actions_completed == len(protocol.actions):
+            elif actions_completed == total_actions:
                 status = 'success'
-                print(f"{'[DRY RUN] ' if self.dry_run else ''}Protocol completed successfully!")
+                print(f"{prefix}Protocol completed successfully!")
             else:
                 status = 'failed'
                 error_message = 'Protocol incomplete'
@@ -274,25 +343,43 @@ class ProtocolExecutor:
         finally:
             with self._lock:
                 self._is_running = False
-                context_dict = self._current_context.to_dict() if self._current_context else None
+                context = self._current_context
                 error_details = self._current_error
                 self._current_protocol = None
                 self._current_context = None
                 self._current_error = None
         
-        duration_ms = int((time.time() - start_time) * 1000)
+        # The context is detached now, so serialize it outside the lock
+        context_dict = context.to_dict() if context else None
+        duration_ms = int((time.monotonic() - start_time) * 1000)
         
         return ExecutionResult(
             protocol_id=protocol.metadata.description,
             status=status,
             actions_completed=actions_completed,
-            total_actions=len(protocol.actions),
+            total_actions=total_actions,
             duration_ms=duration_ms,
             error=error_message,
             error_details=error_details,
             context=context_dict
         )
     
+    def _wait(self, wait_seconds: float) -> None:
+        """
+        Wait after an action, compensating for the previous wait's oversleep.
+        
+        The wait ends at a deadline shortened by however long the previous
+        wait overran, and any overrun of this one is carried to the next.
+        
+        Args:
+            wait_seconds: Requested wait in seconds
+        """
+        deadline = time.monotonic() + wait_seconds - self._oversleep
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        self._oversleep = max(0.0, time.monotonic() - deadline)
+    
     def _execute_action(self, action: ActionStep) -> Any:
         """
         Execute a single action step.
@@ -320,16 +407,17 @@ class ProtocolExecutor:
         if action.action == 'visual_navigate':
             return self._execute_visual_navigate(action)
         
-        # Substitute variables in parameters
+        # Substitute variables in parameters in a single walk; template-free
+        # params come back as the same object (handlers only read params)
         params = self._substitute_variables(action.params)
         
         # Log parameters
         if params:
-            print(f"  Parameters: {params}")
+            logger.debug("  Parameters: %s", params)
         
         # Execute action via registry
         if self.dry_run:
-            print(f"  [DRY RUN] Would execute: {action.action}({params})")
+            logger.debug("  [DRY RUN] Would execute: %s(%s)", action.action, params)
             return None
         else:
             result = self.action_registry.execute(action.action, params)
@@ -415,69 +503,73 @@ class ProtocolExecutor:
         if not self._current_protocol:
             raise RuntimeError("Cannot execute macro without active protocol")
         
+        return self._run_macro(action.params)
+    
+    def _run_macro(self, params: Dict[str, Any]) -> List[Any]:
+        """
+        Run the macro named in a macro action's params.
+        
+        Nested macro calls recurse with their substituted params directly,
+        without wrapping them in a new ActionStep.
+        
+        Args:
+            params: Macro action params ('name' and optional 'vars')
+            
+        Returns:
+            List of results, one per action in the macro
+        """
         # Get macro name
-        macro_name = action.params.get('name')
+        macro_name = params.get('name')
         if not macro_name:
             raise ValueError("Macro action must specify 'name' parameter")
         
         # Get macro definition
-        if macro_name not in self._current_protocol.macros:
+        macro = self._current_protocol.macros.get(macro_name)
+        if macro is None:
             raise ValueError(f"Macro '{macro_name}' not defined in protocol")
         
-        macro = self._current_protocol.macros[macro_name]
-        
         # Get variables for substitution
-        macro_vars = action.params.get('vars', {})
+        macro_vars = params.get('vars', {})
         
-        print(f"  Executing macro: {macro_name}")
+        logger.info("  Executing macro: %s", macro_name)
         if macro_vars:
-            print(f"  Variables: {macro_vars}")
+            logger.debug("  Variables: %s", macro_vars)
         
         # Execute each action in the macro
         results = []
         for i, macro_action in enumerate(macro.actions):
+            action_name = macro_action.action
+            
             # Substitute variables in macro action parameters
             substituted_params = self._substitute_variables_in_dict(
                 macro_action.params,
                 macro_vars
             )
             
-            # Create a new action with substituted parameters
-            substituted_action = ActionStep(
-                action=macro_action.action,
-                params=substituted_params,
-                wait_after_ms=macro_action.wait_after_ms,
-                description=macro_action.description
-            )
-            
             # Check for nested macro calls
-            if substituted_action.action == 'macro':
+            if action_name == 'macro':
                 # Recursive macro execution
-                result = self._execute_macro_action(substituted_action)
+                result = self._run_macro(substituted_params)
             else:
                 # Execute regular action
-                print(f"    [{i + 1}/{len(macro.actions)}] {substituted_action.action}")
+                logger.debug("    [%d/%d] %s", i + 1, len(macro.actions), action_name)
                 if substituted_params:
-                    print(f"      Parameters: {substituted_params}")
+                    logger.debug("      Parameters: %s", substituted_params)
                 
                 if self.dry_run:
-                    print(f"      [DRY RUN] Would execute: {substituted_action.action}({substituted_params})")
+                    logger.debug("      [DRY RUN] Would execute: %s(%s)", action_name, substituted_params)
                     result = None
                 else:
-                    result = self.action_registry.execute(
-                        substituted_action.action,
-                        substituted_params
-                    )
+                    result = self.action_registry.execute(action_name, substituted_params)
             
             results.append(result)
             
             # Apply wait_after_ms timing
-            if substituted_action.wait_after_ms > 0:
-                wait_seconds = substituted_action.wait_after_ms / 1000.0
+            if macro_action.wait_after_ms > 0:
                 if self.dry_run:
-                    print(f"      [DRY RUN] Would wait {substituted_action.wait_after_ms}ms")
+                    logger.debug("      [DRY RUN] Would wait %sms", macro_action.wait_after_ms)
                 else:
-                    time.sleep(wait_seconds)
+                    self._wait(macro_action.wait_after_ms / 1000.0)
         
         return results
     
@@ -560,10 +652,10 @@ class ProtocolExecutor:
             # Wait for workflow completion
             # The AI Brain will handle the visual navigation workflow and send back a result
             # We poll for a completion message or timeout
-            start_time = time.time()
+            start_time = time.monotonic()
             result = None
             
-            while time.time() - start_time < timeout_seconds:
+            while time.monotonic() - start_time < timeout_seconds:
                 # Check for visual navigation result
                 # This would be sent by AI Brain when workflow completes
                 result_msg = message_broker.receive_visual_navigation_result(request_id, timeout=0.5)
@@ -679,7 +771,8 @@ class ProtocolExecutor:
             variables: Dictionary of variable values
             
         Returns:
-            Dictionary with variables substituted
+            Dictionary with variables substituted (data itself if nothing
+            was substituted; handlers only read their params)
             
         Raises:
             ValueError: If a required variable is not found in context
@@ -687,55 +780,121 @@ class ProtocolExecutor:
         Requirements:
         - 7.1: Variable substitution with {{var}} syntax
         """
-        import re
-        
-        result = {}
+        # Coordinate-style params ({x: int, y: int}) have nothing to substitute
+        if not any(isinstance(value, (str, dict, list)) for value in data.values()):
+            return data
         
+        # Copy on the first substituted value only
+        result = None
         for key, value in data.items():
-            if isinstance(value, str):
-                # Substitute variables in string values
-                # Pattern: {{variable_name}}
-                pattern = r'\{\{(\w+)\}\}'
-                
-                # Check if there are any variables to substitute
-                matches = re.findall(pattern, value)
-                if matches:
-                    # Check if all variables exist
-                    missing_vars = [var for var in matches if var not in variables]
-                    if missing_vars:
-                        raise ValueError(
-                            f"Missing required variables in context: {', '.join(missing_vars)}. "
-                            f"Available variables: {', '.join(variables.keys()) if variables else 'none'}. "
-                            f"Hint: Variables like 'verified_x' and 'verified_y' come from 'verify_screen' action results."
-                        )
-                    
-                    # Special case: if the entire value is a single variable, return the actual value (preserving type)
-                    if len(matches) == 1 and value == f"{{{{{matches[0]}}}}}":
-                        result[key] = variables[matches[0]]
-                        continue
-                
-                def replace_var(match):
-                    var_name = match.group(1)
-                    return str(variables[var_name])
-                
-                result[key] = re.sub(pattern, replace_var, value)
-                
-            elif isinstance(value, dict):
-                # Recursively substitute in nested dictionaries
-                result[key] = self._substitute_variables_in_dict(value, variables)
-                
-            elif isinstance(value, list):
-                # Substitute in list items
-                result[key] = [
-                    self._substitute_variables_in_dict({'item': item}, variables)['item']
-                    if isinstance(item, (dict, str)) else item
-                    for item in value
-                ]
-            else:
-                # Keep other types as-is
-                result[key] = value
+            new_value = self._substitute_value(value, variables)
+            if new_value is not value:
+                if result is None:
+                    result = dict(data)
+                result[key] = new_value
+        return data if result is None else result
+    
+    def _substitute_value(self, value: Any, variables: Dict[str, Any]) -> Any:
+        """
+        Substitute variables in a single parameter value.
         
-        return result
+        Strings are substituted, dicts and lists are walked recursively, and
+        other types are returned as-is.
+        
+        Args:
+            value: Parameter value that may contain variable references
+            variables: Dictionary of variable values
+            
+        Returns:
+            Value with variables substituted (the same object if unchanged)
+        """
+        # Exact types resolve with one dict lookup instead of an isinstance chain
+        substitute = self._SUBSTITUTERS.get(type(value))
+        if substitute is not None:
+            return substitute(self, value, variables)
+        if not isinstance(value, (str, dict, list)):
+            return value
+        
+        # Subclasses of the container types
+        if isinstance(value, str):
+            return self._substitute_string(value, variables)
+        if isinstance(value, dict):
+            return self._substitute_variables_in_dict(value, variables)
+        return self._substitute_list(value, variables)
+    
+    def _substitute_list(self, value: List[Any], variables: Dict[str, Any]) -> List[Any]:
+        """
+        Substitute variables in each item of a list.
+        
+        Args:
+            value: List that may contain variable references
+            variables: Dictionary of variable values
+            
+        Returns:
+            List with variables substituted (value itself if unchanged)
+        """
+        result = None
+        for i, item in enumerate(value):
+            new_item = self._substitute_value(item, variables)
+            if new_item is not item:
+                if result is None:
+                    result = list(value)
+                result[i] = new_item
+        return value if result is None else result
+    
+    def _substitute_string(self, value: str, variables: Dict[str, Any]) -> Any:
+        """
+        Substitute {{variable_name}} references in a string.
+        
+        Args:
+            value: String that may contain variable references
+            variables: Dictionary of variable values
+            
+        Returns:
+            Substituted string, or the variable's value itself (type preserved)
+            when the whole string is a single reference
+            
+        Raises:
+            ValueError: If a referenced variable is not in variables
+        """
+        # Most strings hold no variables; skip the regex for them
+        if '{{' not in value:
+            return value
+        
+        # Check if there are any variables to substitute
+        matches, whole_var, template = _parse_template(value)
+        if not matches:
+            return value
+        
+        # Check if all variables exist
+        missing_vars = [var for var in matches if var not in variables]
+        if missing_vars:
+            raise ValueError(
+                f"Missing required variables in context: {', '.join(missing_vars)}. "
+                f"Available variables: {', '.join(variables.keys()) if variables else 'none'}. "
+                f"Hint: Variables like 'verified_x' and 'verified_y' come from 'verify_screen' action results."
+            )
+        
+        # Special case: if the entire value is a single variable, return the actual value (preserving type)
+        if whole_var:
+            return variables[whole_var]
+        
+        # format_map fills every reference in one C-level pass
+        if template is not None:
+            return template.format_map(variables)
+        
+        def replace_var(match):
+            var_name = match.group(1)
+            return str(variables[var_name])
+        
+        return _VAR_PATTERN.sub(replace_var, value)
+    
+    # Substitution handler per exact parameter type, used by _substitute_value
+    _SUBSTITUTERS = {
+        str: _substitute_string,
+        dict: _substitute_variables_in_dict,
+        list: _substitute_list,
+    }
     
     def pause_execution(self) -> bool:
         """
@@ -749,6 +908,7 @@ class ProtocolExecutor:
         with self._lock:
             if self._is_running and not self._is_paused:
                 self._is_paused = True
+                self._resume_event.clear()
                 print("Execution paused")
                 return True
             return False
@@ -765,6 +925,7 @@ class ProtocolExecutor:
         with self._lock:
             if self._is_running and self._is_paused:
                 self._is_paused = False
+                self._resume_event.set()
                 print("Execution resumed")
                 return True
             return False
@@ -782,6 +943,7 @@ class ProtocolExecutor:
             if self._is_running:
                 self._should_stop = True
                 self._is_paused = False  # Unpause if paused
+                self._resume_event.set()
                 print("Emergency stop triggered!")
                 return True
             return False
@@ -795,24 +957,27 @@ class ProtocolExecutor:
             
         Requirements: 10.2 - State retrieval
         """
-        with self._lock:
-            status = {
-                'is_running': self._is_running,
-                'is_paused': self._is_paused,
-                'dry_run': self.dry_run
-            }
-            
-            if self._current_protocol:
-                status['protocol_id'] = self._current_protocol.metadata.description
-                status['current_action'] = self._current_context.current_action_index + 1
-                status['total_actions'] = len(self._current_protocol.actions)
-            
-            return status
+        # Status is polled while the protocol runs, so it is read without the
+        # lock; protocol and context are taken into locals before use since the
+        # executor clears them when execution finishes
+        status = {
+            'is_running': self._is_running,
+            'is_paused': self._is_paused,
+            'dry_run': self.dry_run
+        }
+        
+        protocol = self._current_protocol
+        context = self._current_context
+        if protocol and context:
+            status['protocol_id'] = protocol.metadata.description
+            status['current_action'] = context.current_action_index + 1
+            status['total_actions'] = len(protocol.actions)
+        
+        return status
     
     def is_running(self) -> bool:
         """Check if a protocol is currently executing."""
-        with self._lock:
-            return self._is_running
+        return self._is_running
     
     def get_context(self) -> Optional[Dict[str, Any]]:
         """
@@ -823,10 +988,10 @@ class ProtocolExecutor:
             
         Requirements: 10.2 - Context retrieval
         """
-        with self._lock:
-            if self._current_context:
-                return self._current_context.to_dict()
-            return None
+        context = self._current_context
+        if context:
+            return context.to_dict()
+        return None
     
     def get_last_error(self) -> Optional[Dict[str, Any]]:
         """
@@ -837,7 +1002,7 @@ class ProtocolExecutor:
             
         Requirements: 4.5 - Error information retrieval
         """
-        with self._lock:
-            if self._current_error:
-                return self._current_error.to_dict()
-            return None
+        error = self._current_error
+        if error:
+            return error.to_dict()
+        return None
@@ -5,18 +5,42 @@ This module defines the core data models for the JSON Instruction Protocol,
 including validation, serialization, and deserialization methods.
 """
 
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Any, Optional, Union
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple, Union
 import json
+import sys
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 class ValidationError(Exception):
     """Raised when protocol validation fails"""
     pass
 
 
-@dataclass
+def _intern(name: Any) -> Any:
+    """
+    Intern an action or macro name parsed from JSON.
+    
+    Names come from a small vocabulary, so interning makes the repeated
+    equality checks and set/dict lookups on them hit the identity fast path.
+    Non-string values are returned unchanged for validate() to report.
+    """
+    return sys.intern(name) if type(name) is str else name
+
+
+# Allowed Metadata.complexity values, in order (listed in error messages)
+_COMPLEXITY_LEVELS = ["simple", "medium", "complex"]
+_VALID_COMPLEXITY = frozenset(_COMPLEXITY_LEVELS)
+
+
+@dataclass(frozen=True, slots=True)
 class Metadata:
     """Protocol metadata"""
     description: str
@@ -29,14 +53,23 @@ class Metadata:
         if not self.description:
             raise ValidationError("Metadata description cannot be empty")
         
-        valid_complexity = ["simple", "medium", "complex"]
-        if self.complexity not in valid_complexity:
+        # The str check keeps unhashable values (e.g. a JSON list) a ValidationError
+        if not isinstance(self.complexity, str) or self.complexity not in _VALID_COMPLEXITY:
             raise ValidationError(
-                f"Invalid complexity '{self.complexity}'. Must be one of: {valid_complexity}"
+                f"Invalid complexity '{self.complexity}'. Must be one of: {_COMPLEXITY_LEVELS}"
             )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            "description": self.description,
+            "complexity": self.complexity,
+            "uses_vision": self.uses_vision,
+            "estimated_duration_seconds": self.estimated_duration_seconds
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionStep:
     """Represents a single action in the protocol"""
     action: str
@@ -54,19 +87,22 @@ class ActionStep:
         Raises:
             ValidationError: If validation fails
         """
-        if not self.action:
+        action = self.action
+        if not action:
             raise ValidationError("Action name cannot be empty")
         
-        if self.action not in valid_actions:
+        if action not in valid_actions:
             raise ValidationError(
-                f"Invalid action '{self.action}'. Must be one of the registered actions."
+                f"Invalid action '{action}'. Must be one of the registered actions."
             )
         
-        if not isinstance(self.params, dict):
-            raise ValidationError(f"Action params must be a dictionary, got {type(self.params)}")
+        params = self.params
+        if not isinstance(params, dict):
+            raise ValidationError(f"Action params must be a dictionary, got {type(params)}")
         
-        if self.wait_after_ms < 0:
-            raise ValidationError(f"wait_after_ms must be non-negative, got {self.wait_after_ms}")
+        wait_after_ms = self.wait_after_ms
+        if wait_after_ms < 0:
+            raise ValidationError(f"wait_after_ms must be non-negative, got {wait_after_ms}")
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -83,18 +119,44 @@ class ActionStep:
     def from_dict(cls, data: Dict[str, Any]) -> 'ActionStep':
         """Create ActionStep from dictionary"""
         return cls(
-            action=data.get("action", ""),
+            action=_intern(data.get("action", "")),
             params=data.get("params", {}),
             wait_after_ms=data.get("wait_after_ms", 0),
             description=data.get("description")
         )
 
 
-@dataclass
+def _action_steps(actions_data: List[Dict[str, Any]]) -> List[ActionStep]:
+    """
+    Build ActionSteps from their dictionaries.
+    
+    Same result as calling ActionStep.from_dict on each item. Steps are
+    allocated with object.__new__ and their slots filled inline, skipping
+    the generated __init__ call per step (ActionStep has no __post_init__).
+    """
+    new = object.__new__
+    step_class = ActionStep
+    intern = sys.intern
+    steps = []
+    append = steps.append
+    for data in actions_data:
+        step = new(step_class)
+        action = data.get("action", "")
+        step.action = intern(action) if type(action) is str else action
+        step.params = data.get("params", {})
+        step.wait_after_ms = data.get("wait_after_ms", 0)
+        step.description = data.get("description")
+        append(step)
+    return steps
+
+
+@dataclass(slots=True)
 class MacroDefinition:
     """Represents a reusable macro (sequence of actions)"""
     name: str
     actions: List[ActionStep] = field(default_factory=list)
+    # Names this macro calls, recorded by validate() or called_macros()
+    _calls: Optional[Tuple[str, ...]] = field(default=None, init=False, repr=False, compare=False)
     
     def validate(self, valid_actions: set, all_macro_names: set = None) -> None:
         """
@@ -113,22 +175,40 @@ class MacroDefinition:
         if not self.actions:
             raise ValidationError(f"Macro '{self.name}' has no actions")
         
-        # Validate each action in the macro
+        # Validate each action in the macro, checking for circular
+        # dependencies (macro calling itself) and recording the called
+        # macros in the same pass
+        check_self_calls = bool(all_macro_names)
+        calls = {}
         for i, action in enumerate(self.actions):
             try:
                 action.validate(valid_actions)
             except ValidationError as e:
                 raise ValidationError(f"Macro '{self.name}' action {i}: {str(e)}")
+            
+            if action.action == "macro" and (target := action.params.get("name")):
+                if check_self_calls and target == self.name:
+                    raise ValidationError(
+                        f"Circular dependency detected: Macro '{self.name}' calls itself"
+                    )
+                calls[target] = None
         
-        # Check for circular dependencies (macro calling itself)
-        if all_macro_names:
-            for action in self.actions:
-                if action.action == "macro":
-                    macro_name = action.params.get("name")
-                    if macro_name == self.name:
-                        raise ValidationError(
-                            f"Circular dependency detected: Macro '{self.name}' calls itself"
-                        )
+        self._calls = tuple(calls)
+    
+    def called_macros(self) -> Tuple[str, ...]:
+        """
+        Names of the macros this macro calls, in first-call order
+        
+        Computed once and kept until the next validate(), which records
+        it afresh, so edits made to the actions before validating are seen.
+        """
+        calls = self._calls
+        if calls is None:
+            calls = self._calls = tuple(dict.fromkeys(
+                name for action in self.actions
+                if action.action == "macro" and (name := action.params.get("name"))
+            ))
+        return calls
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -140,11 +220,26 @@ class MacroDefinition:
     @classmethod
     def from_dict(cls, name: str, actions_data: List[Dict[str, Any]]) -> 'MacroDefinition':
         """Create MacroDefinition from dictionary"""
-        actions = [ActionStep.from_dict(action_data) for action_data in actions_data]
-        return cls(name=name, actions=actions)
+        return cls(name=_intern(name), actions=_action_steps(actions_data))
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Encode protocol model objects for ProtocolSchema.to_json.
+    
+    The encoder calls this for each model object as it reaches it, so the
+    output matches to_dict() without building the whole dict tree first.
+    """
+    if isinstance(obj, ActionStep):
+        return obj.to_dict()
+    if isinstance(obj, MacroDefinition):
+        return obj.actions
+    if isinstance(obj, Metadata):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
-@dataclass
+@dataclass(slots=True)
 class ProtocolSchema:
     """
     Main protocol schema representing a complete automation workflow
@@ -174,9 +269,14 @@ class ProtocolSchema:
         except ValidationError as e:
             raise ValidationError(f"Metadata validation failed: {str(e)}")
         
+        # One hashed set for every action and macro step membership check
+        if type(valid_actions) is not frozenset:
+            valid_actions = frozenset(valid_actions)
+        
         # Validate macros
-        macro_names = set(self.macros.keys())
-        for macro_name, macro in self.macros.items():
+        macros = self.macros
+        macro_names = macros.keys()
+        for macro_name, macro in macros.items():
             try:
                 macro.validate(valid_actions, macro_names)
             except ValidationError as e:
@@ -195,14 +295,15 @@ class ProtocolSchema:
                 
                 # If action is a macro, verify it exists
                 if action.action == "macro":
-                    macro_name = action.params.get("name")
+                    params_get = action.params.get
+                    macro_name = params_get("name")
                     if not macro_name:
                         raise ValidationError("Macro action must specify 'name' parameter")
-                    if macro_name not in self.macros:
+                    if macro_name not in macros:
                         raise ValidationError(f"Macro '{macro_name}' not defined")
                     
                     # Validate variable substitution syntax
-                    vars_dict = action.params.get("vars", {})
+                    vars_dict = params_get("vars", {})
                     if not isinstance(vars_dict, dict):
                         raise ValidationError("Macro 'vars' parameter must be a dictionary")
                         
@@ -211,42 +312,77 @@ class ProtocolSchema:
     
     def _check_circular_macro_dependencies(self) -> None:
         """
-        Check for circular dependencies between macros using depth-first search
+        Check for circular dependencies between macros
+        
+        Runs an iterative Tarjan strongly-connected-components pass over the
+        macro call graph, so each macro and call is visited once and deep
+        macro chains don't recurse in Python.
         
         Raises:
             ValidationError: If circular dependency is detected
         """
-        def visit(macro_name: str, visited: set, rec_stack: set) -> None:
-            visited.add(macro_name)
-            rec_stack.add(macro_name)
+        macros = self.macros
+        calls = {
+            name: [target for target in macro.called_macros() if target in macros]
+            for name, macro in macros.items()
+        }
+        
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack = set()
+        
+        for root in calls:
+            if root in index:
+                continue
             
-            if macro_name not in self.macros:
-                return
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(calls[root]))]
             
-            macro = self.macros[macro_name]
-            for action in macro.actions:
-                if action.action == "macro":
-                    called_macro = action.params.get("name")
-                    if called_macro:
-                        if called_macro not in visited:
-                            visit(called_macro, visited, rec_stack)
-                        elif called_macro in rec_stack:
+            while work:
+                node, targets = work[-1]
+                for target in targets:
+                    if target not in index:
+                        # Descend; the rest of node's targets resume afterwards
+                        index[target] = lowlink[target] = len(index)
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(calls[target])))
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], index[target])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        
+                        if len(component) > 1:
                             raise ValidationError(
-                                f"Circular dependency detected: {macro_name} -> {called_macro}"
+                                f"Circular dependency detected between macros: "
+                                f"{', '.join(sorted(component))}"
+                            )
+                        if node in calls[node]:
+                            raise ValidationError(
+                                f"Circular dependency detected: {node} -> {node}"
                             )
-            
-            rec_stack.remove(macro_name)
-        
-        visited = set()
-        for macro_name in self.macros.keys():
-            if macro_name not in visited:
-                visit(macro_name, visited, set())
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert protocol to dictionary"""
         result = {
             "version": self.version,
-            "metadata": asdict(self.metadata),
+            "metadata": self.metadata.to_dict(),
             "actions": [action.to_dict() for action in self.actions]
         }
         
@@ -258,17 +394,55 @@ class ProtocolSchema:
         
         return result
     
+    def _json_data(self) -> Dict[str, Any]:
+        """Top-level protocol dict with model objects left in place for _json_default"""
+        data = {
+            "version": self.version,
+            "metadata": self.metadata,
+            "actions": self.actions
+        }
+        if self.macros:
+            data["macros"] = self.macros
+        return data
+    
     def to_json(self, indent: int = 2) -> str:
         """
         Serialize protocol to JSON string
         
         Args:
-            indent: JSON indentation level
+            indent: JSON indentation level (None for compact output)
             
         Returns:
             JSON string representation
         """
-        return json.dumps(self.to_dict(), indent=indent)
+        # orjson only indents by two spaces; other levels use the stdlib
+        if orjson is not None and indent in (2, None):
+            return self.to_json_bytes(pretty=bool(indent)).decode("utf-8")
+        return json.dumps(self._json_data(), indent=indent, default=_json_default)
+    
+    def to_json_bytes(self, pretty: bool = False) -> bytes:
+        """
+        Serialize protocol to UTF-8 JSON bytes
+        
+        For writing straight to a file or socket without going through str.
+        
+        Args:
+            pretty: Indent by two spaces instead of compact output
+            
+        Returns:
+            JSON bytes representation
+        """
+        if orjson is None:
+            return json.dumps(
+                self._json_data(), indent=2 if pretty else None, default=_json_default
+            ).encode("utf-8")
+        
+        # Passthrough so dataclasses reach _json_default instead of orjson's field
+        # dump; non-str keys are stringified as the stdlib encoder does
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(self._json_data(), default=_json_default, option=option)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ProtocolSchema':
@@ -305,11 +479,13 @@ class ProtocolSchema:
         # Parse macros
         macros = {}
         if "macros" in data:
-            for macro_name, macro_actions in data["macros"].items():
-                macros[macro_name] = MacroDefinition.from_dict(macro_name, macro_actions)
+            macros = {
+                (name := _intern(macro_name)): MacroDefinition(name, _action_steps(macro_actions))
+                for macro_name, macro_actions in data["macros"].items()
+            }
         
         # Parse actions
-        actions = [ActionStep.from_dict(action_data) for action_data in data["actions"]]
+        actions = _action_steps(data["actions"])
         
         return cls(
             version=data["version"],
@@ -333,8 +509,8 @@ class ProtocolSchema:
             ValidationError: If JSON is invalid or required fields are missing
         """
         try:
-            data = json.loads(json_str)
-        except json.JSONDecodeError as e:
+            data = _loads(json_str)
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
             raise ValidationError(f"Invalid JSON: {str(e)}")
         
         return cls.from_dict(data)
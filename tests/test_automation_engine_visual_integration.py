@@ -15,6 +15,17 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 class TestAutomationEngineVisualIntegration(unittest.TestCase):
     """Test visual navigation integration in automation engine."""
     
+    @staticmethod
+    def _run_loop_once(app):
+        """Run the engine main loop until it first polls for a protocol."""
+        def stop_after_poll(timeout=0):
+            app.running = False
+            return None
+        
+        app.message_broker.receive_protocol.side_effect = stop_after_poll
+        app.poll_interval = 0
+        app.start()
+    
     @patch('automation_engine.main.VisualNavigationHandler')
     @patch('automation_engine.main.MessageBroker')
     @patch('automation_engine.main.ScreenCapture')
@@ -72,33 +83,25 @@ class TestAutomationEngineVisualIntegration(unittest.TestCase):
         
         # Simulate receiving a visual navigation request, then None
         visual_request = {
+            'type': 'visual_navigation_request',
             'request_id': 'test-123',
             'task_description': 'Click the button',
             'workflow_goal': 'Complete the form'
         }
-        mock_message_broker.receive_visual_navigation_request.side_effect = [
+        mock_message_broker.receive_visual_engine_message.side_effect = [
             visual_request,
-            None,
             None
         ]
-        mock_message_broker.receive_visual_action_command.return_value = None
-        mock_message_broker.receive_protocol.return_value = None
         
         # Create app
         app = AutomationEngineApp(config_path='config.json', dry_run=True)
         
-        # Run one iteration of the loop
-        app.running = True
-        try:
-            # Simulate one loop iteration
-            visual_req = app.message_broker.receive_visual_navigation_request(timeout=0)
-            if visual_req:
-                app.visual_handler.handle_visual_navigation_request(visual_req)
-        except Exception:
-            pass
+        # Run the main loop until it polls for protocols
+        self._run_loop_once(app)
         
         # Verify handler was called
         mock_visual_handler.handle_visual_navigation_request.assert_called_once_with(visual_request)
+        mock_visual_handler.execute_visual_action.assert_not_called()
     
     @patch('automation_engine.main.VisualNavigationHandler')
     @patch('automation_engine.main.MessageBroker')
@@ -127,6 +130,7 @@ class TestAutomationEngineVisualIntegration(unittest.TestCase):
         
         # Simulate receiving a visual action command
         action_command = {
+            'type': 'visual_action_command',
             'request_id': 'test-123',
             'action': 'click',
             'coordinates': {'x': 100, 'y': 200},
@@ -138,34 +142,22 @@ class TestAutomationEngineVisualIntegration(unittest.TestCase):
             'error': None
         }
         
-        mock_message_broker.receive_visual_navigation_request.return_value = None
-        mock_message_broker.receive_visual_action_command.side_effect = [
+        mock_message_broker.receive_visual_engine_message.side_effect = [
             action_command,
-            None,
             None
         ]
-        mock_message_broker.receive_protocol.return_value = None
         mock_visual_handler.execute_visual_action.return_value = action_result
         
         # Create app
         app = AutomationEngineApp(config_path='config.json', dry_run=True)
         
-        # Run one iteration of the loop
-        app.running = True
-        try:
-            # Simulate one loop iteration
-            visual_req = app.message_broker.receive_visual_navigation_request(timeout=0)
-            if not visual_req:
-                action_cmd = app.message_broker.receive_visual_action_command(timeout=0)
-                if action_cmd:
-                    result = app.visual_handler.execute_visual_action(action_cmd)
-                    app.message_broker.send_visual_action_result(result)
-        except Exception:
-            pass
+        # Run the main loop until it polls for protocols
+        self._run_loop_once(app)
         
         # Verify handler was called
         mock_visual_handler.execute_visual_action.assert_called_once_with(action_command)
         mock_message_broker.send_visual_action_result.assert_called_once_with(action_result)
+        mock_visual_handler.handle_visual_navigation_request.assert_not_called()
 
 
 if __name__ == '__main__':
@@ -2,6 +2,7 @@
 Test script for the communication module.
 Verifies workflow and status message passing.
 """
+import asyncio
 import uuid
 from datetime import datetime
 from shared.communication import MessageBroker, CommunicationError
@@ -186,6 +187,96 @@ def test_no_message_timeout():
     return True
 
 
+def test_workflow_ordering():
+    """Test that queued workflows are received in send order."""
+    print("\nTesting workflow ordering...")
+    
+    broker = MessageBroker("shared/messages_test")
+    broker.clear_messages()
+    
+    workflow_ids = [str(uuid.uuid4()) for _ in range(5)]
+    for workflow_id in workflow_ids:
+        broker.send_workflow(Workflow(id=workflow_id, steps=[WorkflowStep(type="wait")]))
+    
+    received_ids = [broker.receive_workflow().id for _ in workflow_ids]
+    assert received_ids == workflow_ids
+    assert broker.receive_workflow() is None
+    
+    print("✓ Workflows received in send order")
+    broker.clear_messages()
+    return True
+
+
+def test_workflow_batch_receive():
+    """Test draining several queued workflows in one call."""
+    print("\nTesting batch workflow receive...")
+    
+    broker = MessageBroker("shared/messages_test")
+    broker.clear_messages()
+    
+    workflow_ids = [str(uuid.uuid4()) for _ in range(5)]
+    for workflow_id in workflow_ids:
+        broker.send_workflow(Workflow(id=workflow_id, steps=[WorkflowStep(type="wait")]))
+    
+    first_batch = broker.receive_workflows(max_batch=3)
+    second_batch = broker.receive_workflows(max_batch=3)
+    assert [w.id for w in first_batch] == workflow_ids[:3]
+    assert [w.id for w in second_batch] == workflow_ids[3:]
+    assert broker.receive_workflows(timeout=0.2) == []
+    
+    print("✓ Batch receive returned workflows in send order")
+    broker.clear_messages()
+    return True
+
+
+def test_async_receive():
+    """Test awaiting workflows and status from an event loop."""
+    print("\nTesting async receive...")
+    
+    broker = MessageBroker("shared/messages_test")
+    broker.clear_messages()
+    
+    workflow_id = str(uuid.uuid4())
+    broker.send_workflow(Workflow(id=workflow_id, steps=[WorkflowStep(type="wait")]))
+    broker.send_status(ExecutionResult(workflow_id=workflow_id, status="success", steps_completed=1))
+    
+    async def receive_all():
+        workflow = await broker.receive_workflow_async(timeout=1.0)
+        status = await broker.receive_status_async(workflow_id, timeout=1.0)
+        missing = await broker.receive_protocol_async(timeout=0.2)
+        return workflow, status, missing
+    
+    workflow, status, missing = asyncio.run(receive_all())
+    assert workflow.id == workflow_id
+    assert status.status == "success"
+    assert missing is None
+    
+    print("✓ Async receive works")
+    broker.clear_messages()
+    return True
+
+
+def test_many_brokers():
+    """Test that brokers keep working past the per-user inotify limit."""
+    print("\nTesting many brokers...")
+    
+    brokers = [MessageBroker("shared/messages_test") for _ in range(200)]
+    try:
+        brokers[0].clear_messages()
+        workflow_id = str(uuid.uuid4())
+        brokers[-1].send_workflow(Workflow(id=workflow_id, steps=[WorkflowStep(type="wait")]))
+        assert brokers[-1].receive_workflow(timeout=1.0).id == workflow_id
+    finally:
+        for broker in brokers:
+            broker.close()
+    
+    with MessageBroker("shared/messages_test") as broker:
+        assert broker.receive_workflow(timeout=0.1) is None
+    
+    print("✓ Brokers fall back to polling and release their watchers")
+    return True
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Communication Module Test Suite")
@@ -195,7 +286,11 @@ if __name__ == "__main__":
         test_workflow_communication,
         test_status_communication,
         test_error_status,
-        test_no_message_timeout
+        test_no_message_timeout,
+        test_workflow_ordering,
+        test_workflow_batch_receive,
+        test_async_receive,
+        test_many_brokers
     ]
     
     passed = 0
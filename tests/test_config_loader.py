@@ -8,6 +8,8 @@ import pytest
 import json
 import os
 import sys
+import threading
+from dataclasses import FrozenInstanceError
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -78,8 +80,8 @@ def test_action_library_config():
     config = get_config()
     
     # Check action library settings
-    assert isinstance(config.action_library.enabled_categories, list)
-    assert isinstance(config.action_library.disabled_actions, list)
+    assert isinstance(config.action_library.enabled_categories, frozenset)
+    assert isinstance(config.action_library.disabled_actions, frozenset)
     
     # Check default categories are present
     expected_categories = [
@@ -163,5 +165,55 @@ def test_default_config_on_missing_file():
     assert config.validation.warning_level == 'all'
 
 
+def test_reload_reuses_unchanged_file(tmp_path):
+    """Test that reloading an unchanged file reuses the parsed config."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"protocol": {"validation": {"strict_mode": True}}}))
+    
+    config1 = ConfigLoader(config_path=str(config_path)).config
+    config2 = ConfigLoader(config_path=str(config_path)).config
+    assert config1 is config2
+    assert config1.validation.strict_mode == True
+
+
+def test_reload_picks_up_file_changes(tmp_path):
+    """Test that an edited config file is parsed again."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"protocol": {"validation": {"strict_mode": True}}}))
+    config1 = ConfigLoader(config_path=str(config_path)).config
+    
+    config_path.write_text(json.dumps({"protocol": {"validation": {"strict_mode": False}}}))
+    # Make sure the modification time changes even on coarse-grained filesystems
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    config2 = ConfigLoader(config_path=str(config_path)).config
+    
+    assert config2 is not config1
+    assert config2.validation.strict_mode == False
+
+
+def test_concurrent_first_load_creates_one_instance(monkeypatch):
+    """Test that concurrent first calls to load() share one parsed config."""
+    monkeypatch.setattr(ConfigLoader, "_instance", None)
+    results = []
+    
+    threads = [threading.Thread(target=lambda: results.append(ConfigLoader.load())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(results) == 8
+    assert all(config is results[0] for config in results)
+
+
+def test_config_is_immutable():
+    """Test that the shared configuration cannot be modified in place."""
+    config = get_config()
+    
+    with pytest.raises(FrozenInstanceError):
+        config.validation.strict_mode = True
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
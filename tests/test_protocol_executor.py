@@ -6,9 +6,10 @@ Tests sequential execution, context management, timing, and control flow.
 
 import pytest
 import time
+from datetime import datetime
 from unittest.mock import Mock, MagicMock
 
-from shared.protocol_executor import ProtocolExecutor, ExecutionContext, ExecutionResult
+from shared.protocol_executor import ProtocolExecutor, ExecutionContext, ExecutionResult, ActionResult
 from shared.protocol_models import ProtocolSchema, ActionStep, Metadata
 from shared.action_registry import ActionRegistry, ActionCategory
 
@@ -45,6 +46,20 @@ class TestExecutionContext:
         assert len(context.action_results) == 1
         assert context.action_results[0]['error'] == "Action not found"
     
+    def test_action_result_record(self):
+        """Test that results are stored as ActionResult records."""
+        context = ExecutionContext(protocol_id="test")
+        context.current_action_index = 2
+        
+        context.add_result("click", {"clicked": True})
+        
+        entry = context.action_results[0]
+        assert isinstance(entry, ActionResult)
+        assert entry.index == 2
+        assert entry.action == "click"
+        assert entry['result'] == {"clicked": True}
+        assert entry.to_dict()['error'] is None
+    
     def test_get_last_result(self):
         """Test retrieving last result."""
         context = ExecutionContext(protocol_id="test")
@@ -81,6 +96,8 @@ class TestExecutionContext:
         assert 'start_time' in context_dict
         assert context_dict['variables'] == {"var1": "value1"}
         assert len(context_dict['action_results']) == 1
+        # Timestamps are stored as epoch seconds and formatted on serialization
+        datetime.fromisoformat(context_dict['action_results'][0]['timestamp'])
 
 
 class TestProtocolExecutor:
@@ -366,6 +383,27 @@ class TestProtocolExecutor:
         assert result.context['action_results'][1]['result'] == "result2"
         assert result.context['action_results'][2]['error'] is not None
 
+    
+    def test_params_without_templates_not_copied(self, executor, mock_registry):
+        """Test that params without {{variables}} reach the handler unchanged."""
+        params = {"text": "hello", "keys": ["ctrl", "c"], "options": {"delay": 5}}
+        protocol = ProtocolSchema(
+            version="1.0",
+            metadata=Metadata(description="Passthrough test"),
+            actions=[
+                ActionStep(action="type", params=params),
+                ActionStep(action="type", params={"text": "{{missing}}"})
+            ]
+        )
+        
+        result = executor.execute_protocol(protocol)
+        
+        assert mock_registry.execute.call_args_list[0].args == ("type", params)
+        assert mock_registry.execute.call_args_list[0].args[1] is params
+        # Templates are still checked against the context
+        assert result.status == 'failed'
+        assert "missing" in result.error
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
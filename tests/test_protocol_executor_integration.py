@@ -112,6 +112,7 @@ class TestProtocolExecutorIntegration:
         assert received_status is not None
         assert received_status['status'] == "success"
         assert received_status['actions_completed'] == 2
+        assert received_status == result.to_dict()
     
     def test_protocol_with_error_sends_error_status(self):
         """Test that protocol errors are properly communicated."""
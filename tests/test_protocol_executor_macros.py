@@ -4,7 +4,7 @@ Tests for ProtocolExecutor macro execution (Task 4.2)
 
 import sys
 import time
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 sys.path.insert(0, '.')
 
@@ -285,6 +285,51 @@ def test_macro_with_timing():
     print(f"✓ Macro timing passed (duration: {duration * 1000:.0f}ms)")
 
 
+def test_macro_waits_compensate_oversleep():
+    """Test that waits inside macros take off the previous wait's oversleep."""
+    print("\nTesting macro oversleep compensation...")
+    
+    mock_registry = Mock(spec=ActionRegistry)
+    mock_registry.execute = Mock(return_value=None)
+    
+    executor = ProtocolExecutor(mock_registry, dry_run=False)
+    
+    protocol = ProtocolSchema(
+        version="1.0",
+        metadata=Metadata(description="Macro oversleep test"),
+        macros={
+            "timed_macro": MacroDefinition(
+                name="timed_macro",
+                actions=[
+                    ActionStep(action="press_key", params={"key": "a"}, wait_after_ms=50),
+                    ActionStep(action="press_key", params={"key": "b"}, wait_after_ms=50)
+                ]
+            )
+        },
+        actions=[
+            ActionStep(action="press_key", params={"key": "x"}, wait_after_ms=50),
+            ActionStep(action="macro", params={"name": "timed_macro"})
+        ]
+    )
+    
+    # Fake clock whose sleeps always overrun by 10ms
+    clock = [0.0]
+    slept = []
+    
+    def fake_sleep(seconds):
+        slept.append(seconds)
+        clock[0] += seconds + 0.01
+    
+    with patch('shared.protocol_executor.time.monotonic', lambda: clock[0]), \
+            patch('shared.protocol_executor.time.sleep', fake_sleep):
+        result = executor.execute_protocol(protocol)
+    
+    assert result.status == 'success'
+    assert [round(seconds, 3) for seconds in slept] == [0.05, 0.04, 0.04]
+    
+    print("✓ Macro waits compensate oversleep")
+
+
 def test_variable_substitution_in_nested_dict():
     """Test variable substitution in nested dictionary parameters."""
     print("\nTesting variable substitution in nested structures...")
@@ -338,6 +383,115 @@ def test_variable_substitution_in_nested_dict():
     print("✓ Variable substitution in nested structures passed")
 
 
+def test_variable_substitution_in_list():
+    """Test variable substitution in list parameters."""
+    print("\nTesting variable substitution in lists...")
+    
+    mock_registry = Mock(spec=ActionRegistry)
+    mock_registry.execute = Mock(return_value=None)
+    
+    executor = ProtocolExecutor(mock_registry, dry_run=False)
+    
+    protocol = ProtocolSchema(
+        version="1.0",
+        metadata=Metadata(description="List substitution test"),
+        macros={
+            "list_macro": MacroDefinition(
+                name="list_macro",
+                actions=[
+                    ActionStep(
+                        action="shortcut",
+                        params={
+                            "keys": ["{{modifier}}", "c"],
+                            "targets": [{"x": "{{x}}"}, 5, ["{{modifier}}"]]
+                        }
+                    )
+                ]
+            )
+        },
+        actions=[
+            ActionStep(
+                action="macro",
+                params={
+                    "name": "list_macro",
+                    "vars": {"modifier": "ctrl", "x": 100}
+                }
+            )
+        ]
+    )
+    
+    result = executor.execute_protocol(protocol)
+    
+    assert result.status == 'success'
+    params = mock_registry.execute.call_args_list[0][0][1]
+    assert params['keys'] == ["ctrl", "c"]
+    assert params['targets'] == [{"x": 100}, 5, ["ctrl"]]
+    
+    print("✓ Variable substitution in lists passed")
+
+
+def test_substitution_copies_only_changed_params():
+    """Test that substitution leaves macro definitions untouched."""
+    print("\nTesting copy-on-substitute...")
+    
+    mock_registry = Mock(spec=ActionRegistry)
+    mock_registry.execute = Mock(return_value=None)
+    
+    executor = ProtocolExecutor(mock_registry, dry_run=False)
+    
+    plain_params = {"key": "enter"}
+    template_params = {"text": "{{message}}", "options": {"speed": "fast"}}
+    protocol = ProtocolSchema(
+        version="1.0",
+        metadata=Metadata(description="Copy test"),
+        macros={
+            "copy_macro": MacroDefinition(
+                name="copy_macro",
+                actions=[
+                    ActionStep(action="press_key", params=plain_params),
+                    ActionStep(action="type", params=template_params)
+                ]
+            )
+        },
+        actions=[
+            ActionStep(action="macro", params={"name": "copy_macro", "vars": {"message": "hi"}})
+        ]
+    )
+    
+    result = executor.execute_protocol(protocol)
+    
+    assert result.status == 'success'
+    calls = mock_registry.execute.call_args_list
+    assert calls[0][0][1] is plain_params
+    assert calls[1][0][1] == {"text": "hi", "options": {"speed": "fast"}}
+    # Unchanged nested values are shared, the definition keeps its template
+    assert calls[1][0][1]["options"] is template_params["options"]
+    assert template_params["text"] == "{{message}}"
+    
+    print("✓ Copy-on-substitute passed")
+
+
+def test_substitution_keeps_literal_braces():
+    """Test that braces around variable references are left alone."""
+    print("\nTesting literal braces in templates...")
+    
+    executor = ProtocolExecutor(Mock(spec=ActionRegistry), dry_run=False)
+    variables = {"name": "Ada", "count": 3, "7": "seven"}
+    
+    result = executor._substitute_variables_in_dict(
+        {
+            "json": '{"user": "{{name}}", "n": {{count}}}',
+            "mixed": "{{7}} and {{count}} {x}"
+        },
+        variables
+    )
+    
+    assert result["json"] == '{"user": "Ada", "n": 3}'
+    assert result["mixed"] == "seven and 3 {x}"
+    
+    print("✓ Literal braces in templates passed")
+
+
 def run_all_tests():
     """Run all macro execution tests."""
     print("=" * 60)
@@ -352,7 +506,11 @@ def run_all_tests():
         test_macro_without_variables()
         test_macro_not_found_error()
         test_macro_with_timing()
+        test_macro_waits_compensate_oversleep()
         test_variable_substitution_in_nested_dict()
+        test_variable_substitution_in_list()
+        test_substitution_copies_only_changed_params()
+        test_substitution_keeps_literal_braces()
         
         print("\n" + "=" * 60)
         print("✓ ALL MACRO TESTS PASSED")
@@ -144,6 +144,18 @@ class TestMacroDefinition:
         assert macro.name == "test_macro"
         assert len(macro.actions) == 1
         assert macro.actions[0].action == "type"
+    
+    def test_from_dict_matches_action_step_from_dict(self):
+        """Test that bulk-built steps equal steps built one at a time"""
+        actions_data = [
+            {"action": "type", "params": {"text": "test"}, "wait_after_ms": 100, "description": "Type"},
+            {"action": "press_key"},
+            {"action": "click", "params": {"x": 1, "y": 2}}
+        ]
+        macro = MacroDefinition.from_dict("test_macro", actions_data)
+        assert macro.actions == [ActionStep.from_dict(data) for data in actions_data]
+        assert macro.actions[1].params == {}
+        assert macro.actions[1].params is not macro.actions[2].params
 
 
 class TestProtocolSchema:
@@ -213,6 +225,62 @@ class TestProtocolSchema:
         with pytest.raises(ValidationError, match="Circular dependency"):
             protocol.validate({"macro"})
     
+    def test_macro_self_call_and_called_macros(self):
+        """Test self-calls are reported by macro validation and calls are recorded"""
+        macro = MacroDefinition(
+            name="outer",
+            actions=[
+                ActionStep(action="macro", params={"name": "inner"}),
+                ActionStep(action="macro", params={"name": "inner"}),
+                ActionStep(action="macro", params={"name": "other"})
+            ]
+        )
+        protocol = ProtocolSchema(
+            version="1.0",
+            metadata=Metadata(description="Test"),
+            macros={
+                "outer": macro,
+                "inner": MacroDefinition(name="inner", actions=[ActionStep(action="type")]),
+                "other": MacroDefinition(name="other", actions=[ActionStep(action="type")])
+            },
+            actions=[ActionStep(action="macro", params={"name": "outer"})]
+        )
+        protocol.validate({"macro", "type"})
+        assert macro.called_macros() == ("inner", "other")
+        
+        # Re-validating sees edits made since the last call
+        macro.actions.append(ActionStep(action="macro", params={"name": "outer"}))
+        with pytest.raises(ValidationError, match="Macro 'outer' calls itself"):
+            protocol.validate({"macro", "type"})
+    
+    def test_macro_dependency_graphs(self):
+        """Test cycle detection on shared, deep and indirect macro calls"""
+        def protocol_with(calls):
+            return ProtocolSchema(
+                version="1.0",
+                metadata=Metadata(description="Test"),
+                macros={
+                    name: MacroDefinition(
+                        name=name,
+                        actions=[ActionStep(action="macro", params={"name": t}) for t in targets]
+                        or [ActionStep(action="type", params={"text": "x"})]
+                    )
+                    for name, targets in calls.items()
+                },
+                actions=[ActionStep(action="type", params={"text": "x"})]
+            )
+        
+        # Diamond: two macros sharing a callee is not a cycle
+        protocol_with({"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": []}).validate({"macro", "type"})
+        
+        # Deep chains are checked without recursion
+        chain = {f"m{i}": [f"m{i + 1}"] for i in range(3000)}
+        chain["m3000"] = []
+        protocol_with(chain).validate({"macro", "type"})
+        
+        with pytest.raises(ValidationError, match="Circular dependency"):
+            protocol_with({"a": ["b"], "b": ["c"], "c": ["a"]}).validate({"macro", "type"})
+    
     def test_serialization_deserialization(self):
         """Test full serialization and deserialization cycle"""
         original = ProtocolSchema(
@@ -250,6 +318,29 @@ class TestProtocolSchema:
         assert restored.actions[0].action == "open_app"
         assert restored.actions[1].params["name"] == "test_macro"
     
+    def test_to_json_matches_to_dict(self):
+        """Test that to_json encodes the same structure as to_dict"""
+        protocol = ProtocolSchema(
+            version="1.0",
+            metadata=Metadata(description="Test", estimated_duration_seconds=5),
+            macros={
+                "test_macro": MacroDefinition(
+                    name="test_macro",
+                    actions=[
+                        ActionStep(action="type", params={"text": "{{q}}"}, description="Type query")
+                    ]
+                )
+            },
+            actions=[
+                ActionStep(action="macro", params={"name": "test_macro", "vars": {"q": "café"}})
+            ]
+        )
+        
+        for indent in (2, None, 4):
+            assert json.loads(protocol.to_json(indent=indent)) == protocol.to_dict()
+        for pretty in (False, True):
+            assert json.loads(protocol.to_json_bytes(pretty=pretty)) == protocol.to_dict()
+    
     def test_from_dict_missing_fields(self):
         """Test that missing required fields raise errors"""
         # Missing version
@@ -1,6 +1,7 @@
 """
 Tests for visual navigation communication in MessageBroker.
 """
+import os
 import pytest
 import time
 import uuid
@@ -120,6 +121,65 @@ def test_visual_navigation_timeout(message_broker):
     assert result is None
 
 
+def test_visual_navigation_request_ordering(message_broker):
+    """Test that requests are received oldest first and never match commands."""
+    request_ids = [str(uuid.uuid4()) for _ in range(3)]
+    for request_id in request_ids:
+        message_broker.send_visual_navigation_request({"request_id": request_id})
+    message_broker.send_visual_action_command({"request_id": "cmd", "action": "click"})
+    
+    received_ids = [
+        message_broker.receive_visual_navigation_request(timeout=0.5)["request_id"]
+        for _ in request_ids
+    ]
+    assert received_ids == request_ids
+    assert message_broker.receive_visual_navigation_request(timeout=0) is None
+    assert message_broker.receive_visual_action_command(timeout=0)["request_id"] == "cmd"
+
+
+def test_visual_action_command_batch_receive(message_broker):
+    """Test draining several queued commands in one call."""
+    request_ids = [str(uuid.uuid4()) for _ in range(4)]
+    for request_id in request_ids:
+        message_broker.send_visual_action_command({"request_id": request_id, "action": "click"})
+    
+    first_batch = message_broker.receive_visual_action_commands(max_batch=3)
+    second_batch = message_broker.receive_visual_action_commands(max_batch=3)
+    assert [c["request_id"] for c in first_batch] == request_ids[:3]
+    assert [c["request_id"] for c in second_batch] == request_ids[3:]
+    assert message_broker.receive_visual_action_commands(timeout=0.2) == []
+
+
+def test_visual_engine_message(message_broker):
+    """Test receiving requests and commands through one shared poll."""
+    message_broker.send_visual_navigation_request({"request_id": "req"})
+    message_broker.send_visual_action_command({"request_id": "cmd", "action": "click"})
+    message_broker.send_visual_navigation_response({"request_id": "req"})
+    
+    first = message_broker.receive_visual_engine_message(timeout=0.5)
+    second = message_broker.receive_visual_engine_message(timeout=0.5)
+    assert (first["type"], first["request_id"]) == ("visual_navigation_request", "req")
+    assert (second["type"], second["request_id"]) == ("visual_action_command", "cmd")
+    assert message_broker.receive_visual_engine_message(timeout=0) is None
+    
+    # Responses are left for their keyed receiver
+    assert message_broker.receive_visual_navigation_response("req", timeout=0) is not None
+
+
+def test_visual_navigation_large_response(message_broker):
+    """Test a screenshot-sized response (large enough to be memory-mapped)."""
+    request_id = str(uuid.uuid4())
+    screenshot = "A" * (512 * 1024)
+    message_broker.send_visual_navigation_response({
+        "request_id": request_id,
+        "screenshot_base64": screenshot
+    })
+    
+    received = message_broker.receive_visual_navigation_response(request_id, timeout=1.0)
+    assert received["screenshot_base64"] == screenshot
+    assert message_broker.receive_visual_navigation_response(request_id, timeout=0) is None
+
+
 def test_visual_navigation_clear_messages(message_broker):
     """Test clearing visual navigation messages."""
     # Send some messages
@@ -221,5 +281,95 @@ def test_visual_navigation_message_structure(message_broker):
     assert "timestamp" in received
 
 
+def test_queue_order_within_one_clock_tick(message_broker, monkeypatch):
+    """Test that messages sent within one clock tick keep their send order."""
+    # Coarse clocks (Windows) return the same value for back-to-back sends
+    monkeypatch.setattr(time, "monotonic_ns", lambda: 1)
+    
+    request_ids = ["9", "10", "b", "a"]
+    for request_id in request_ids:
+        message_broker.send_visual_navigation_request({"request_id": request_id})
+        message_broker.send_visual_action_command({"request_id": request_id, "action": "click"})
+    
+    requests = message_broker.receive_visual_navigation_requests(max_batch=10)
+    commands = message_broker.receive_visual_action_commands(max_batch=10)
+    assert [r["request_id"] for r in requests] == request_ids
+    assert [c["request_id"] for c in commands] == request_ids
+    
+    for protocol_id in request_ids:
+        message_broker.send_protocol({"metadata": {"id": protocol_id}, "actions": []})
+    protocols = message_broker.receive_protocols(max_batch=10)
+    assert [p["metadata"]["id"] for p in protocols] == request_ids
+
+
+def test_send_protocol_with_non_string_keys(message_broker):
+    """Test that non-string dict keys are written as strings."""
+    message_broker.send_protocol({
+        "metadata": {"id": "keys"},
+        "actions": [{"action": "x", "params": {1: "a"}}]
+    })
+    
+    received = message_broker.receive_protocol()
+    assert received["actions"][0]["params"] == {"1": "a"}
+
+
+def test_batch_receive_keeps_messages_before_bad_file(message_broker):
+    """Test that a malformed file doesn't lose the messages parsed before it."""
+    for request_id in ("first", "second"):
+        message_broker.send_visual_navigation_request({"request_id": request_id})
+    bad_file = message_broker.visual_nav_dir / message_broker._sequenced_name("bad", "request_")
+    bad_file.write_text("{not json")
+    message_broker.send_visual_navigation_request({"request_id": "last"})
+    
+    requests = message_broker.receive_visual_navigation_requests(max_batch=10)
+    assert [r["request_id"] for r in requests] == ["first", "second"]
+    
+    # The bad file heads the next call, which reports it and drops it
+    with pytest.raises(CommunicationError):
+        message_broker.receive_visual_navigation_requests(max_batch=10)
+    assert not bad_file.exists()
+    
+    requests = message_broker.receive_visual_navigation_requests(max_batch=10)
+    assert [r["request_id"] for r in requests] == ["last"]
+
+
+def test_batch_receive_keeps_file_on_io_error(message_broker, monkeypatch):
+    """Test that an I/O error while reading never deletes the message file."""
+    from shared import communication
+    
+    message_broker.send_visual_navigation_request({"request_id": "kept"})
+    load_file = communication._load_file
+    
+    def locked(path):
+        raise PermissionError(13, "Permission denied", str(path))
+    
+    monkeypatch.setattr(communication, "_load_file", locked)
+    with pytest.raises(CommunicationError):
+        message_broker.receive_visual_navigation_requests(max_batch=10)
+    
+    monkeypatch.setattr(communication, "_load_file", load_file)
+    requests = message_broker.receive_visual_navigation_requests(max_batch=10)
+    assert [r["request_id"] for r in requests] == ["kept"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_generates_distinct_protocol_ids(message_broker):
+    """Test that a forked sender doesn't reuse its parent's protocol IDs."""
+    message_broker.send_protocol({"metadata": {}, "actions": []})
+    
+    pid = os.fork()
+    if pid == 0:
+        try:
+            message_broker.send_protocol({"metadata": {}, "actions": []})
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    message_broker.send_protocol({"metadata": {}, "actions": []})
+    
+    ids = [p["metadata"]["id"] for p in message_broker.receive_protocols(max_batch=10)]
+    assert len(ids) == 3
+    assert len(set(ids)) == 3
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -6,6 +6,7 @@ without burning through API credits or actually moving the mouse.
 """
 import sys
 import os
+import time
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from shared.action_registry import ActionRegistry
@@ -271,6 +272,31 @@ def test_complex_workflow_mock():
     return result.status == 'success'
 
 
+def test_mock_fast_mode():
+    """Test that fast mode skips simulated durations but still logs actions."""
+    
+    print("\n" + "="*60)
+    print("TESTING MOCK FAST MODE")
+    print("="*60 + "\n")
+    
+    action_registry = ActionRegistry()
+    mock_handlers = MockActionHandlers(action_registry, fast_mode=True)
+    mock_handlers.register_all_mock_actions()
+    
+    start = time.perf_counter()
+    action_registry.execute('open_app', {'app_name': 'chrome'})
+    action_registry.execute('wait', {'duration_ms': 5000})
+    elapsed = time.perf_counter() - start
+    
+    log = mock_handlers.get_execution_log()
+    print(f"Executed {len(log)} mock actions in {elapsed:.3f}s")
+    
+    assert elapsed < 1.0
+    assert [entry['action'] for entry in log] == ['open_app', 'wait']
+    
+    return True
+
+
 if __name__ == "__main__":
     print("\n" + "="*60)
     print("MOCK ACTION TESTING SUITE")
@@ -286,7 +312,8 @@ if __name__ == "__main__":
     tests = [
         ("Basic Protocol Execution", test_mock_protocol_execution),
         ("Verify Screen Mock", test_verify_screen_mock),
-        ("Complex Workflow with Macros", test_complex_workflow_mock)
+        ("Complex Workflow with Macros", test_complex_workflow_mock),
+        ("Mock Fast Mode", test_mock_fast_mode)
     ]
     
     results = []
@@ -47,17 +47,17 @@ def verify_visual_navigation_integration():
     check5 = 'message_broker=self.message_broker' in content
     checks.append(('message_broker parameter', check5))
     
-    # Check 6: Visual navigation request polling
-    check6 = 'receive_visual_navigation_request' in content
-    checks.append(('Visual navigation request polling', check6))
+    # Check 6: Visual navigation message polling (requests and commands in one scan)
+    check6 = 'receive_visual_engine_message' in content
+    checks.append(('Visual navigation message polling', check6))
     
     # Check 7: Visual navigation request handling
     check7 = 'handle_visual_navigation_request' in content
     checks.append(('Visual navigation request handling', check7))
     
-    # Check 8: Visual action command polling
-    check8 = 'receive_visual_action_command' in content
-    checks.append(('Visual action command polling', check8))
+    # Check 8: Visual action command dispatch by message type
+    check8 = '"visual_action_command"' in content
+    checks.append(('Visual action command dispatch', check8))
     
     # Check 9: Visual action execution
     check9 = 'execute_visual_action' in content
@@ -84,8 +84,8 @@ def verify_visual_navigation_integration():
         print("Integration Summary:")
         print("  - VisualNavigationHandler is imported and initialized")
         print("  - Handler receives screen_capture, mouse_controller, and message_broker")
-        print("  - Main loop polls for visual navigation requests")
-        print("  - Main loop polls for visual action commands")
+        print("  - Main loop polls for visual navigation requests and action commands")
+        print("  - Messages are dispatched by type to the handler")
         print("  - Visual actions are executed and results are sent back")
         return True
     else: